@@ -1,19 +1,37 @@
 # Fichier: backend/server.py
-from fastapi import FastAPI, APIRouter, HTTPException, Body, Depends, status, Request
+from fastapi import FastAPI, APIRouter, HTTPException, Body, Depends, status, Request, Response, Query
 from fastapi.security import OAuth2PasswordBearer
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, FileResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from pymongo.read_preferences import Primary, PrimaryPreferred, Secondary, SecondaryPreferred, Nearest
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, field_validator, StringConstraints
-from typing import List, Optional, Dict, Any, Union, Annotated
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator, StringConstraints
+from typing import List, Optional, Dict, Any, Set, Union, Annotated, NamedTuple, Callable
 import uuid
 from datetime import datetime, timezone, timedelta
 import random
 import math
+import re
+import json
+import base64
+import time
+import asyncio
+import io
+import threading
+import contextvars
+import cProfile
+import pstats
+from collections import OrderedDict
 from bson import ObjectId
 
 # --- Imports Sécurité ---
@@ -36,12 +54,41 @@ if not SECRET_KEY:
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 
 
+# --- Constantes des acteurs de tournoi ---
+TOURNAMENT_ACTOR_IDLE_SECONDS = float(os.environ.get("TOURNAMENT_ACTOR_IDLE_SECONDS", 300))
+TOURNAMENT_ACTOR_MAX_BATCH = int(os.environ.get("TOURNAMENT_ACTOR_MAX_BATCH", 50))
+TOURNAMENT_ACTOR_MAX_CONFLICTS = 5 # Écritures concurrentes d'autres processus tolérées par lot avant un 409
+
+# --- Constantes du format suisse ---
+MAX_GROUP_PLAYERS = 64
+MAX_SWISS_PLAYERS = 2048
+# Nombre maximal de retours arrière du moteur d'appariement avant repli sur le meilleur appariement partiel
+SWISS_PAIRING_MAX_BACKTRACKS = int(os.environ.get("SWISS_PAIRING_MAX_BACKTRACKS", 20000))
+
+# --- Constantes d'administration des utilisateurs ---
+USERS_PAGE_DEFAULT = 50
+USERS_PAGE_MAX = 200
+BOOTSTRAP_MARKER_ID = "bootstrap" # Présent dès qu'un Super Admin a été créé
+USER_COUNTERS_ID = "user_counters" # Compteurs d'utilisateurs (total et par statut)
+
+# --- Constantes de profilage ---
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0)) # 0 = uniquement sur demande (en-tête X-Profile)
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", ROOT_DIR / "profiles"))
+PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", 50))
+PROFILE_ID_PATTERN = re.compile(r"^[0-9T]+_[0-9a-f]{8}$")
+
+# --- Constantes de réponse ---
+# Les réponses plus petites que ce seuil (en octets) ne sont pas compressées
+GZIP_MINIMUM_SIZE = int(os.environ.get("GZIP_MINIMUM_SIZE", 1024))
+JSON_PATCH_MEDIA_TYPE = "application/json-patch+json"
+
 # --- Rate Limiter Setup ---
 limiter = Limiter(key_func=get_remote_address)
 
 # --- Configuration Passlib ---
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 # --- Connexion MongoDB ---
 mongo_url = os.environ.get('MONGO_URL')
@@ -50,10 +97,47 @@ db_name = os.environ.get('DB_NAME', 'fc26')
 if not mongo_url:
     logging.error("Erreur critique: La variable d'environnement MONGO_URL n'est pas définie.")
 
-client = AsyncIOMotorClient(mongo_url)
-db = client[db_name]
+# Lectures publiques (spectateurs) routées vers les secondaires d'un replica set, avec une borne de retard.
+# En local : mongod --replSet rs0, rs.initiate(), puis MONGO_URL=mongodb://localhost:27017/?replicaSet=rs0
+READ_PREFERENCES = {"primary": Primary, "primaryPreferred": PrimaryPreferred, "secondary": Secondary, "secondaryPreferred": SecondaryPreferred, "nearest": Nearest}
+PUBLIC_READ_PREFERENCE_NAME = os.environ.get("MONGO_PUBLIC_READ_PREFERENCE", "secondaryPreferred")
+MAX_STALENESS_SECONDS = int(os.environ.get("MONGO_MAX_STALENESS_SECONDS", 90)) # -1 = pas de borne (minimum driver : 90)
+
+def build_read_preference(name: str, max_staleness: int):
+    if name not in READ_PREFERENCES:
+        logging.warning(f"Read preference inconnue '{name}', utilisation de 'primary'")
+        name = "primary"
+    if name == "primary": return Primary()
+    if 0 <= max_staleness < 90:
+        logging.warning(f"MONGO_MAX_STALENESS_SECONDS={max_staleness} inférieur au minimum du driver, 90s utilisées")
+        max_staleness = 90
+    return READ_PREFERENCES[name](max_staleness=max_staleness)
+
+# Temps passé dans Mongo pour les requêtes profilées (Motor propage le contexte aux threads du driver).
+# Un tuple de compteurs : un lot de l'acteur de tournoi crédite chacune des requêtes profilées qu'il sert.
+current_profile_stats: contextvars.ContextVar = contextvars.ContextVar("current_profile_stats", default=())
+
+class MongoProfilingListener(monitoring.CommandListener):
+    def started(self, event): pass
+    def succeeded(self, event): self._record(event)
+    def failed(self, event): self._record(event)
+
+    def _record(self, event):
+        for stats in current_profile_stats.get():
+            if not stats["active"]: continue
+            with stats["lock"]:
+                stats["commands"] += 1
+                stats["waitMs"] += event.duration_micros / 1000
+
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoProfilingListener()])
+# Lectures et écritures "majority" : sans elles, une session causale ne garantit plus la lecture de ses propres
+# écritures après une bascule de primaire (une écriture non répliquée peut être annulée, une lecture "local" non confirmée).
+db = client.get_database(db_name, read_concern=ReadConcern("majority"), write_concern=WriteConcern("majority"))
 tournaments_collection = db["tournaments"]
+# Lectures publiques (anonymes, sans session causale) : "local", au plus près du secondaire choisi
+public_tournaments_collection = tournaments_collection.with_options(read_preference=build_read_preference(PUBLIC_READ_PREFERENCE_NAME, MAX_STALENESS_SECONDS), read_concern=ReadConcern("local"))
 users_collection = db["users"]
+meta_collection = db["meta"]
 
 # --- FastAPI App et Routers ---
 app = FastAPI(title="Tournament API - Secured V4")
@@ -79,8 +163,92 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers["X-XSS-Protection"] = "1; mode=block"
         return response
 
+# Compression gzip des grosses réponses (tournois complets, listes).
+# Ajouté avant les middlewares "BaseHTTPMiddleware" pour recevoir le corps complet et respecter le seuil.
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
 app.add_middleware(SecurityHeadersMiddleware)
 
+# --- Middleware de Profilage (à la demande) ---
+# Déclenché par l'en-tête "X-Profile: 1" d'un Super Admin, ou par échantillonnage (PROFILE_SAMPLE_RATE).
+# cProfile mesure tout le thread de la boucle : un seul profil à la fois, les requêtes concurrentes
+# pendant la capture apparaissent aussi dans le profil (ordre de grandeur, pas une mesure isolée).
+profile_in_progress = False
+
+def summarize_profile(profiler: cProfile.Profile) -> Dict[str, Any]:
+    # Le temps Mongo n'est pas lu ici : Motor exécute pymongo dans des threads que cProfile ne voit pas
+    # (voir mongoWaitMs, mesuré par MongoProfilingListener).
+    stats = pstats.Stats(profiler)
+    pydantic_s = 0.0; engine_s = 0.0
+    for (filename, _, funcname), (_, _, tottime, _, callers) in stats.stats.items():
+        if "pydantic" in filename or "pydantic" in funcname: pydantic_s += tottime
+        if filename == __file__ and funcname.endswith("_logic"):
+            # Temps inclusif des fonctions moteur, sans double compte des appels entre fonctions moteur
+            engine_s += sum(c[3] for (c_file, _, c_func), c in callers.items() if not (c_file == __file__ and c_func.endswith("_logic")))
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+    return {
+        "pydanticMs": round(pydantic_s * 1000, 3),
+        "engineLogicMs": round(engine_s * 1000, 3),
+        "totalCpuMs": round(stats.total_tt * 1000, 3),
+        "topFunctions": out.getvalue(),
+    }
+
+def store_profile(profile_id: str, profiler: cProfile.Profile, summary: Dict[str, Any]):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(PROFILE_DIR / f"{profile_id}.prof")
+    (PROFILE_DIR / f"{profile_id}.json").write_text(json.dumps(summary, default=str))
+    # Rotation : les identifiants commencent par l'horodatage, l'ordre alphabétique est chronologique
+    for old in sorted(PROFILE_DIR.glob("*.json"))[:-PROFILE_MAX_FILES]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".prof").unlink(missing_ok=True)
+
+async def is_super_admin_request(request: Request) -> bool:
+    auth = request.headers.get("authorization", "")
+    if not auth.lower().startswith("bearer "): return False
+    try: user = await get_current_user(auth[7:])
+    except HTTPException: return False
+    return user.role == "super_admin"
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        global profile_in_progress
+        trigger = None
+        if request.headers.get("x-profile") == "1" and await is_super_admin_request(request): trigger = "header"
+        elif PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE: trigger = "sampling"
+        if trigger is None or profile_in_progress:
+            return await call_next(request)
+
+        profile_in_progress = True
+        mongo_stats = {"active": True, "commands": 0, "waitMs": 0.0, "lock": threading.Lock()}
+        token = current_profile_stats.set((mongo_stats,))
+        profiler = cProfile.Profile()
+        started_at = datetime.now(timezone.utc); start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.disable()
+            mongo_stats["active"] = False
+            current_profile_stats.reset(token)
+            profile_in_progress = False
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        profile_id = f"{started_at:%Y%m%dT%H%M%S%f}_{uuid.uuid4().hex[:8]}"
+        summary = {
+            "id": profile_id, "createdAt": started_at.isoformat(), "method": request.method, "path": request.url.path,
+            "status": response.status_code, "trigger": trigger, "wallMs": round(wall_ms, 3),
+            "mongoCommands": mongo_stats["commands"], "mongoWaitMs": round(mongo_stats["waitMs"], 3),
+            **summarize_profile(profiler),
+        }
+        try:
+            await asyncio.to_thread(store_profile, profile_id, profiler, summary)
+            response.headers["X-Profile-Id"] = profile_id
+        except OSError as e:
+            logging.error(f"Profil {profile_id} non enregistré: {e}")
+        return response
+
+app.add_middleware(ProfilingMiddleware)
+
 # --- Fonctions de Sanitization (Anti-XSS) ---
 def sanitize_text(text: str) -> str:
     if not text: return ""
@@ -130,17 +298,37 @@ class KnockoutMatch(BaseModel):
     winner: Optional[str] = None
     played: bool = False
 
+class SwissPlayer(PlayerStats):
+    buchholz: int = Field(ge=0, default=0) # Somme des points des adversaires, tenue à jour incrémentalement
+    opponents: List[str] = []
+    byes: int = Field(ge=0, default=0)
+
+class SwissMatch(BaseModel):
+    id: str = Field(default_factory=lambda: f"match_{uuid.uuid4()}")
+    round: int = Field(ge=0)
+    player1: str
+    player2: Optional[str] = None # None = exempt (bye)
+    score1: Optional[int] = Field(ge=0, default=None)
+    score2: Optional[int] = Field(ge=0, default=None)
+    played: bool = False
+
 class Tournament(BaseModel):
     id: str = Field(default_factory=lambda: f"tournoi_{uuid.uuid4()}", alias="_id")
     name: str
     format: str = "1v1"
+    stage: str = "groups" # Première phase : "groups" (poules) ou "swiss" (rondes suisses)
     players: List[str]
     groups: List[Group] = []
+    swissPlayers: List[SwissPlayer] = []
+    swissMatches: List[SwissMatch] = []
+    swissRound: int = Field(ge=0, default=0) # Nombre de rondes suisses déjà appariées
+    swissTotalRounds: int = Field(ge=0, default=0)
     knockoutMatches: List[KnockoutMatch] = []
     qualifiedPlayers: List[str] = []
     winner: Optional[str] = None
     thirdPlace : Optional[str] = None
     currentStep: str = "config"
+    version: int = Field(ge=0, default=0) # Incrémentée à chaque mutation (base des réponses delta)
     createdAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updatedAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     owner_username: Optional[str] = "Ancien Admin"
@@ -156,13 +344,15 @@ class TournamentCreateRequest(BaseModel):
     tournamentName: Optional[str] = "Tournoi EA FC"
     numGroups: Optional[int] = Field(None, ge=2, le=16) # Limite réaliste pour les poules
     format: Optional[str] = "1v1"
+    stage: Optional[str] = "groups"
+    swissRounds: Optional[int] = Field(None, ge=1, le=20) # Par défaut : log2(nombre d'équipes/joueurs)
 
     @field_validator('playerNames')
     def validate_and_sanitize_players(cls, v):
         if len(v) < 4:
             raise ValueError("Minimum 4 joueurs requis")
-        if len(v) > 64:
-            raise ValueError("Maximum 64 joueurs autorisés")
+        if len(v) > MAX_SWISS_PLAYERS:
+            raise ValueError(f"Maximum {MAX_SWISS_PLAYERS} joueurs autorisés")
         
         cleaned = []
         for name in v:
@@ -189,6 +379,19 @@ class TournamentCreateRequest(BaseModel):
             raise ValueError("Format invalide (1v1 ou 2v2 uniquement)")
         return v
 
+    @field_validator('stage')
+    def validate_stage(cls, v):
+        if v not in ["groups", "swiss"]:
+            raise ValueError("Phase invalide (groups ou swiss uniquement)")
+        return v
+
+    @model_validator(mode='after')
+    def validate_players_for_stage(self):
+        # Les poules (round-robin) ne passent pas à l'échelle : seule la ronde suisse accepte les grands tableaux
+        if self.stage != "swiss" and len(self.playerNames) > MAX_GROUP_PLAYERS:
+            raise ValueError(f"Maximum {MAX_GROUP_PLAYERS} joueurs autorisés (utilisez le format suisse au-delà)")
+        return self
+
 class ScoreUpdateRequest(BaseModel):
     score1: int = Field(ge=0, le=99) # Anti-troll: max 99 buts
     score2: int = Field(ge=0, le=99)
@@ -291,6 +494,68 @@ async def get_current_super_admin(current_user: UserInDB = Depends(get_current_u
         raise HTTPException(status_code=403, detail="Privilèges Super Admin requis.")
     return current_user
 
+async def get_optional_user(token: Optional[str] = Depends(oauth2_scheme_optional)):
+    # Routes publiques : un jeton absent ou invalide signifie simplement "spectateur anonyme"
+    if not token: return None
+    try: return await get_current_user(token)
+    except HTTPException: return None
+
+# --- Sessions causales (admins authentifiés) ---
+# Chaque admin garde son dernier clusterTime/operationTime : ses requêtes suivantes lisent au moins ses propres
+# écritures, même après une bascule de primaire (lectures et écritures "majority", voir la connexion Mongo).
+# Les lectures admin restent sur le primaire.
+# Les mutations passent par l'acteur du tournoi, qui avance la session de l'admin jusqu'à l'écriture du lot.
+admin_causal_tokens: Dict[str, tuple] = {}
+
+async def _causal_session_for(username: str):
+    async with await client.start_session(causal_consistency=True) as session:
+        cluster_time, operation_time = admin_causal_tokens.get(username, (None, None))
+        if cluster_time: session.advance_cluster_time(cluster_time)
+        if operation_time: session.advance_operation_time(operation_time)
+        yield session
+        if session.operation_time: admin_causal_tokens[username] = (session.cluster_time, session.operation_time)
+
+async def get_admin_session(current_user: UserInDB = Depends(get_current_user)):
+    async for session in _causal_session_for(current_user.username): yield session
+
+async def get_optional_admin_session(current_user: Optional[UserInDB] = Depends(get_optional_user)):
+    if current_user is None:
+        yield None
+        return
+    async for session in _causal_session_for(current_user.username): yield session
+
+# --- Compteurs d'utilisateurs (cache en base, évite les count_documents) ---
+
+async def bump_user_counters(old_status: Optional[str], new_status: Optional[str], session=None):
+    inc = {}
+    if old_status: inc[f"byStatus.{old_status}"] = -1
+    if new_status: inc[f"byStatus.{new_status}"] = inc.get(f"byStatus.{new_status}", 0) + 1
+    if old_status is None and new_status: inc["total"] = 1
+    if new_status is None and old_status: inc["total"] = -1
+    if inc: await meta_collection.update_one({"_id": USER_COUNTERS_ID}, {"$inc": inc}, upsert=True, session=session)
+
+async def get_user_counters(session=None) -> Dict[str, Any]:
+    counters = await meta_collection.find_one({"_id": USER_COUNTERS_ID}, session=session) or {}
+    return {"total": counters.get("total", 0), "byStatus": counters.get("byStatus", {})}
+
+async def refresh_user_counters():
+    # Recalcul complet, uniquement au démarrage : corrige une éventuelle dérive des compteurs
+    by_status = {}
+    async for row in users_collection.aggregate([{"$group": {"_id": "$status", "n": {"$sum": 1}}}]):
+        by_status[row["_id"] or "active"] = by_status.get(row["_id"] or "active", 0) + row["n"]
+    await meta_collection.update_one({"_id": USER_COUNTERS_ID}, {"$set": {"total": sum(by_status.values()), "byStatus": by_status}}, upsert=True)
+
+async def ensure_user_indexes():
+    await users_collection.create_index([("createdAt", -1), ("_id", -1)])
+    await users_collection.create_index([("status", 1), ("createdAt", -1), ("_id", -1)])
+    await users_collection.create_index([("status", 1), ("username", 1)])
+    try:
+        await users_collection.create_index("username", unique=True)
+    except OperationFailure as e:
+        # Doublons hérités : on garde un index simple plutôt que de bloquer le démarrage
+        logging.warning(f"Index unique sur username impossible ({e}), index simple utilisé")
+        await users_collection.create_index("username")
+
 # --- Routes d'Authentification ---
 
 @auth_router.post("/register", response_model=UserBase, status_code=201)
@@ -302,15 +567,17 @@ async def register_user(request: Request, user_in: UserCreate):
     if existing_user:
         raise HTTPException(status_code=400, detail="Ce nom d'utilisateur est déjà pris")
     
-    user_count = await users_collection.count_documents({})
-    if user_count == 0:
+    hashed_password = get_password_hash(user_in.password)
+
+    # Le premier inscrit devient Super Admin : l'insertion du marqueur est atomique, sans comptage de la collection
+    try:
+        await meta_collection.insert_one({"_id": BOOTSTRAP_MARKER_ID, "superAdmin": user_in.username, "createdAt": datetime.now(timezone.utc)})
         role = "super_admin"
         status_account = "active"
-    else:
+    except DuplicateKeyError:
         role = "admin"
         status_account = "pending"
 
-    hashed_password = get_password_hash(user_in.password)
     user_doc = {
         "username": user_in.username, 
         "hashed_password": hashed_password,
@@ -319,7 +586,14 @@ async def register_user(request: Request, user_in: UserCreate):
         "createdAt": datetime.now(timezone.utc)
     }
     
-    new_user = await users_collection.insert_one(user_doc)
+    try:
+        new_user = await users_collection.insert_one(user_doc)
+    except Exception as e:
+        # Marqueur libéré si le Super Admin n'a pas été créé : sinon plus personne ne pourrait valider les inscriptions
+        if role == "super_admin": await meta_collection.delete_one({"_id": BOOTSTRAP_MARKER_ID, "superAdmin": user_in.username})
+        if isinstance(e, DuplicateKeyError): raise HTTPException(status_code=400, detail="Ce nom d'utilisateur est déjà pris")
+        raise
+    await bump_user_counters(None, status_account)
     created_user = await users_collection.find_one({"_id": new_user.inserted_id})
     created_user["_id"] = str(created_user["_id"])
     
@@ -356,12 +630,12 @@ async def login_for_access_token(request: Request, user_in: UserLogin):
         raise HTTPException(status_code=500, detail=f"Erreur interne du serveur")
 
 @auth_router.put("/profile", response_model=UserBase)
-async def update_profile(updates: UserUpdate, current_user: UserInDB = Depends(get_current_user)):
+async def update_profile(updates: UserUpdate, current_user: UserInDB = Depends(get_current_user), session = Depends(get_admin_session)):
     update_data = {}
     
     if updates.username:
         if updates.username != current_user.username:
-             existing = await users_collection.find_one({"username": updates.username})
+             existing = await users_collection.find_one({"username": updates.username}, session=session)
              if existing:
                  raise HTTPException(status_code=400, detail="Ce nom d'utilisateur est déjà pris")
              update_data["username"] = updates.username
@@ -372,73 +646,150 @@ async def update_profile(updates: UserUpdate, current_user: UserInDB = Depends(g
     if not update_data:
          raise HTTPException(status_code=400, detail="Aucune donnée à mettre à jour")
          
-    await users_collection.update_one({"_id": ObjectId(current_user.id)}, {"$set": update_data})
+    await users_collection.update_one({"_id": ObjectId(current_user.id)}, {"$set": update_data}, session=session)
     
-    updated_user_doc = await users_collection.find_one({"_id": ObjectId(current_user.id)})
+    updated_user_doc = await users_collection.find_one({"_id": ObjectId(current_user.id)}, session=session)
     updated_user_doc["_id"] = str(updated_user_doc["_id"])
     return UserBase(**updated_user_doc)
 
 # --- Routes SUPER ADMIN ---
 
-@api_router.get("/admin/users/pending", response_model=List[UserBase])
-async def get_pending_users(current_user: UserInDB = Depends(get_current_super_admin)):
-    users = await users_collection.find({"status": "pending"}).to_list(100)
+# Pagination par curseur (keyset) : pas de skip, chaque page est une lecture d'index bornée.
+# Sans recherche : tri createdAt/_id décroissant. Avec recherche : préfixe de username (sensible à la casse
+# pour rester servi par l'index), tri username croissant. Le total vient des compteurs en cache.
+
+def encode_users_cursor(user: dict, by_username: bool) -> str:
+    created_at = user.get("createdAt")
+    key = {"u": user["username"]} if by_username else {"c": created_at.isoformat() if created_at else None, "i": str(user["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def decode_users_cursor(cursor: str, by_username: bool) -> Dict[str, Any]:
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if by_username: return {"$gt": str(key["u"])}
+        created_at = datetime.fromisoformat(key["c"]) if key["c"] else None
+        last_id = ObjectId(key["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide")
+    # Comptes hérités sans createdAt : triés en dernier, on ne départage plus que par _id
+    if created_at is None: return {"createdAt": None, "_id": {"$lt": last_id}}
+    # $lt ne retient jamais null/absent : les comptes sans createdAt (après toutes les dates) sont ajoutés explicitement
+    return {"$or": [{"createdAt": {"$lt": created_at}}, {"createdAt": created_at, "_id": {"$lt": last_id}}, {"createdAt": None}]}
+
+async def list_users_page(response: Response, base_filter: dict, q: Optional[str], cursor: Optional[str], limit: int, total: Optional[int], session=None):
+    by_username = bool(q)
+    query = dict(base_filter)
+    if by_username:
+        query["username"] = {"$regex": f"^{re.escape(q)}"}
+        if cursor: query["username"].update(decode_users_cursor(cursor, True))
+        sort = [("username", 1)]
+    else:
+        if cursor: query.update(decode_users_cursor(cursor, False))
+        sort = [("createdAt", -1), ("_id", -1)]
+    users = await users_collection.find(query, projection={"hashed_password": 0}, session=session).sort(sort).limit(limit + 1).to_list(limit + 1)
+    if len(users) > limit:
+        users = users[:limit]
+        response.headers["X-Next-Cursor"] = encode_users_cursor(users[-1], by_username)
+    if total is not None and not by_username: response.headers["X-Total-Count"] = str(total)
     for u in users: u["_id"] = str(u["_id"])
     return users
 
+@api_router.get("/admin/users/pending", response_model=List[UserBase])
+async def get_pending_users(
+    response: Response,
+    q: Optional[str] = Query(None, max_length=30),
+    cursor: Optional[str] = None,
+    limit: int = Query(USERS_PAGE_DEFAULT, ge=1, le=USERS_PAGE_MAX),
+    current_user: UserInDB = Depends(get_current_super_admin),
+    session = Depends(get_admin_session)
+):
+    counters = await get_user_counters(session)
+    return await list_users_page(response, {"status": "pending"}, q, cursor, limit, counters["byStatus"].get("pending", 0), session)
+
 @api_router.get("/admin/users", response_model=List[UserBase])
-async def get_all_users(current_user: UserInDB = Depends(get_current_super_admin)):
-    users = await users_collection.find({}).sort("createdAt", -1).to_list(500)
-    for u in users: u["_id"] = str(u["_id"])
-    return users
+async def get_all_users(
+    response: Response,
+    q: Optional[str] = Query(None, max_length=30),
+    cursor: Optional[str] = None,
+    limit: int = Query(USERS_PAGE_DEFAULT, ge=1, le=USERS_PAGE_MAX),
+    current_user: UserInDB = Depends(get_current_super_admin),
+    session = Depends(get_admin_session)
+):
+    counters = await get_user_counters(session)
+    return await list_users_page(response, {}, q, cursor, limit, counters["total"], session)
 
 @api_router.delete("/admin/users/{username}", status_code=204)
-async def delete_user_admin(username: str, current_user: UserInDB = Depends(get_current_super_admin)):
+async def delete_user_admin(username: str, current_user: UserInDB = Depends(get_current_super_admin), session = Depends(get_admin_session)):
     if username == current_user.username:
         raise HTTPException(status_code=400, detail="Vous ne pouvez pas vous supprimer vous-même.")
         
-    user_to_delete = await users_collection.find_one({"username": username})
+    user_to_delete = await users_collection.find_one({"username": username}, session=session)
     if not user_to_delete:
         raise HTTPException(status_code=404, detail="Utilisateur introuvable")
         
-    await users_collection.delete_one({"username": username})
+    res = await users_collection.delete_one({"username": username}, session=session)
+    if res.deleted_count: await bump_user_counters(user_to_delete.get("status", "active"), None, session)
     logging.info(f"Utilisateur {username} supprimé par Super Admin {current_user.username}")
     return
 
 @api_router.post("/admin/users/{username}/approve", response_model=UserBase)
-async def approve_user(username: str, current_user: UserInDB = Depends(get_current_super_admin)):
-    user = await users_collection.find_one({"username": username})
+async def approve_user(username: str, current_user: UserInDB = Depends(get_current_super_admin), session = Depends(get_admin_session)):
+    user = await users_collection.find_one({"username": username}, session=session)
     if not user: raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
-    await users_collection.update_one({"username": username}, {"$set": {"status": "active"}})
-    updated_user = await users_collection.find_one({"username": username})
+    res = await users_collection.update_one({"username": username}, {"$set": {"status": "active"}}, session=session)
+    if res.modified_count: await bump_user_counters(user.get("status", "active"), "active", session)
+    updated_user = await users_collection.find_one({"username": username}, session=session)
     updated_user["_id"] = str(updated_user["_id"])
     return UserBase(**updated_user)
 
 @api_router.post("/admin/users/{username}/reject", response_model=UserBase)
-async def reject_user(username: str, current_user: UserInDB = Depends(get_current_super_admin)):
-    user = await users_collection.find_one({"username": username})
+async def reject_user(username: str, current_user: UserInDB = Depends(get_current_super_admin), session = Depends(get_admin_session)):
+    user = await users_collection.find_one({"username": username}, session=session)
     if not user: raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
-    await users_collection.update_one({"username": username}, {"$set": {"status": "rejected"}})
-    updated_user = await users_collection.find_one({"username": username})
+    res = await users_collection.update_one({"username": username}, {"$set": {"status": "rejected"}}, session=session)
+    if res.modified_count: await bump_user_counters(user.get("status", "active"), "rejected", session)
+    updated_user = await users_collection.find_one({"username": username}, session=session)
     updated_user["_id"] = str(updated_user["_id"])
     return UserBase(**updated_user)
 
+@api_router.get("/admin/profiles")
+async def list_profiles(current_user: UserInDB = Depends(get_current_super_admin)):
+    def read_summaries():
+        if not PROFILE_DIR.exists(): return []
+        summaries = []
+        for path in sorted(PROFILE_DIR.glob("*.json"), reverse=True):
+            try: summaries.append(json.loads(path.read_text()))
+            except (OSError, ValueError): continue
+        return summaries
+    return await asyncio.to_thread(read_summaries)
+
+@api_router.get("/admin/profiles/{profile_id}")
+async def download_profile(profile_id: str, current_user: UserInDB = Depends(get_current_super_admin)):
+    # L'identifiant est validé strictement : aucun chemin arbitraire ne peut être servi
+    if not PROFILE_ID_PATTERN.match(profile_id): raise HTTPException(status_code=400, detail="Identifiant de profil invalide")
+    path = PROFILE_DIR / f"{profile_id}.prof"
+    if not path.exists(): raise HTTPException(status_code=404, detail="Profil introuvable")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
 
 # --- Fonctions Utilitaires (Tournoi) ---
 # ... (create_groups_logic, update_group_standings_logic, etc. - Logique inchangée, mais données déjà nettoyées par Pydantic)
 
-def create_groups_logic(players: List[str], num_groups: Optional[int] = None, format: str = "1v1") -> List[Group]:
+def build_entities_logic(players: List[str], format: str = "1v1", stats_cls=PlayerStats) -> List[PlayerStats]:
     # Les noms 'players' sont déjà sanitized par Pydantic
     entities = []
     if format == "2v2":
         for i in range(0, len(players), 2):
             if i+1 < len(players):
                 p1 = players[i]; p2 = players[i+1]
-                entities.append(PlayerStats(name=f"{p1} + {p2}", real_players=[p1, p2]))
+                entities.append(stats_cls(name=f"{p1} + {p2}", real_players=[p1, p2]))
             else:
-                 entities.append(PlayerStats(name=players[i], real_players=[players[i]]))
+                 entities.append(stats_cls(name=players[i], real_players=[players[i]]))
     else:
-        entities = [PlayerStats(name=p) for p in players]
+        entities = [stats_cls(name=p) for p in players]
+    return entities
+
+def create_groups_logic(players: List[str], num_groups: Optional[int] = None, format: str = "1v1") -> List[Group]:
+    entities = build_entities_logic(players, format)
     
     totalEntities = len(entities)
     if num_groups is None or num_groups <= 1:
@@ -482,11 +833,14 @@ def update_group_standings_logic(group: Group) -> List[PlayerStats]:
     for i, player in enumerate(sorted_players): player.groupPosition = i + 1
     return sorted_players
 
+def qualifier_target_logic(total_entities: int) -> int:
+    if total_entities <= 8: return 4
+    elif total_entities <= 16: return 8
+    else: return 16 if total_entities >= 24 else 8 
+
 def determine_qualifiers_logic(groups: List[Group], total_players: int) -> List[str]:
     total_entities = sum(len(g.players) for g in groups)
-    if total_entities <= 8: target = 4
-    elif total_entities <= 16: target = 8
-    else: target = 16 if total_entities >= 24 else 8 
+    target = qualifier_target_logic(total_entities)
     num_groups = len(groups)
     qualified = []
     if target % num_groups == 0:
@@ -533,60 +887,180 @@ def generate_knockout_matches_logic(qualified_names: List[str], single_round: bo
              matches.append(KnockoutMatch(id=f"match_third_place_{uuid.uuid4()}", round=final_round_index, matchIndex=1, player1=None, player2=None))
     return matches
 
-# --- Routes API (Tournoi) ---
-
-@api_router.post("/tournament", response_model=Tournament, status_code=201)
-async def create_tournament(
-    request: TournamentCreateRequest, 
-    current_user: UserInDB = Depends(get_current_user)
-): 
-    # Les données sont validées et nettoyées par Pydantic (TournamentCreateRequest)
-    player_names = request.playerNames
-    
-    if request.format == "2v2" and len(player_names) % 2 != 0: 
-        raise HTTPException(status_code=400, detail="Pour un tournoi 2v2, le nombre de joueurs doit être pair.")
-    
-    generated_groups = create_groups_logic(player_names, request.numGroups, request.format or "1v1")
-    
-    new_tournament = Tournament(
-        name=request.tournamentName, # Déjà nettoyé
-        players=player_names, 
-        currentStep="groups", 
-        groups=generated_groups, 
-        owner_username=current_user.username, 
-        format=request.format or "1v1"
-    )
-    
-    t_dict = new_tournament.model_dump(by_alias=True)
-    t_dict["createdAt"] = new_tournament.createdAt
-    t_dict["updatedAt"] = new_tournament.updatedAt
-    
-    res = await tournaments_collection.insert_one(t_dict)
-    created = await tournaments_collection.find_one({"_id": res.inserted_id})
-    if created: created["_id"] = str(created["_id"])
-    logging.info(f"Tournoi créé par {current_user.username} (Audit Log)")
-    return Tournament(**created)
+# --- Format Suisse ---
+# Chaque ronde apparie les joueurs (ou équipes 2v2) de même score sans revanche. Le Buchholz (somme des points
+# des adversaires) est tenu à jour à chaque score : pas de recalcul complet, même avec 1000+ participants.
+
+def swiss_standings_key(p: dict):
+    return (p["points"], p["buchholz"], p["goalDiff"], p["goalsFor"])
+
+def create_swiss_logic(players: List[str], format: str = "1v1", num_rounds: Optional[int] = None):
+    entities = build_entities_logic(players, format, stats_cls=SwissPlayer)
+    random.shuffle(entities) # Ordre de la première ronde (aucun classement initial)
+    max_rounds = max(1, len(entities) - 1) # Au-delà, une revanche devient inévitable
+    default_rounds = max(1, math.ceil(math.log2(len(entities))))
+    return entities, min(num_rounds or default_rounds, max_rounds)
+
+def pair_swiss_players_logic(ranked: List[str], opponents: Dict[str, set]) -> List[tuple]:
+    # Appariement glouton dans l'ordre du classement (donc par groupe de score, avec flotteurs vers le groupe
+    # suivant), avec retour arrière itératif lorsque la fin du tableau ne peut plus être appariée sans revanche.
+    # Si aucun appariement complet n'est trouvé (plafond de retours arrière atteint ou revanche inévitable), on garde
+    # le plus long appariement partiel rencontré et seuls les joueurs restants sont complétés, revanches comprises.
+    n = len(ranked)
+    paired = [False] * n
+    stack = []; best = []
+    i = 0; candidate = 1; backtracks = 0
+    while True:
+        while i < n and paired[i]: i += 1
+        if i >= n: return [(ranked[a], ranked[b]) for a, b in stack]
+        if candidate <= i: candidate = i + 1
+        already_met = opponents.get(ranked[i], ())
+        found = next((c for c in range(candidate, n) if not paired[c] and ranked[c] not in already_met), None)
+        if found is not None:
+            paired[i] = paired[found] = True
+            stack.append((i, found))
+            if len(stack) > len(best): best = list(stack)
+            candidate = 0
+            continue
+        backtracks += 1
+        if not stack or backtracks > SWISS_PAIRING_MAX_BACKTRACKS: return complete_swiss_pairing_logic(ranked, opponents, best)
+        i, previous = stack.pop()
+        paired[i] = paired[previous] = False
+        candidate = previous + 1
+
+def complete_swiss_pairing_logic(ranked: List[str], opponents: Dict[str, set], partial: List[tuple]) -> List[tuple]:
+    # Complète un appariement partiel (indices dans ranked) : chaque joueur restant, dans l'ordre du classement,
+    # affronte le premier restant non encore rencontré, ou à défaut le suivant au classement (revanche).
+    used = {index for pair in partial for index in pair}
+    leftovers = [name for index, name in enumerate(ranked) if index not in used]
+    pairs = [(ranked[a], ranked[b]) for a, b in partial]
+    while leftovers:
+        p1 = leftovers.pop(0)
+        already_met = opponents.get(p1, ())
+        p2 = next((name for name in leftovers if name not in already_met), leftovers[0])
+        leftovers.remove(p2)
+        pairs.append((p1, p2))
+    return pairs
+
+# Index nom -> position dans swissPlayers, par liste (copie chaude de l'acteur ou du simulateur) : un score ne touche
+# que deux joueurs et leurs adversaires, l'index n'est reconstruit que si la liste a été triée ou remplacée depuis.
+SWISS_PLAYER_INDEX_CACHE_SIZE = 256
+_swiss_player_indexes: "OrderedDict[int, tuple]" = OrderedDict()
+
+def _swiss_player(players: List[dict], name: str) -> dict:
+    cached = _swiss_player_indexes.get(id(players))
+    if cached is not None and cached[0] is players:
+        index = cached[1].get(name)
+        if index is not None and index < len(players) and players[index]["name"] == name: return players[index]
+    positions = {p["name"]: i for i, p in enumerate(players)}
+    _swiss_player_indexes[id(players)] = (players, positions)
+    _swiss_player_indexes.move_to_end(id(players))
+    while len(_swiss_player_indexes) > SWISS_PLAYER_INDEX_CACHE_SIZE: _swiss_player_indexes.popitem(last=False)
+    return players[positions[name]]
+
+def _find_swiss_match(tournament: dict, match_id: str) -> Optional[dict]:
+    # Les identifiants suisses portent la position du match dans swissMatches (match_swiss_<position>_<uuid>)
+    matches = tournament.get("swissMatches") or []
+    if match_id.startswith("match_swiss_"):
+        position = match_id.split("_")[2]
+        if position.isdigit() and int(position) < len(matches) and matches[int(position)].get("id") == match_id: return matches[int(position)]
+    # Anciens identifiants (match_<uuid>, comme les matchs de poule ou du tableau) : recherche complète, ronde en cours d'abord
+    if matches and not matches[0].get("id", "").startswith("match_swiss_"):
+        return next((m for m in reversed(matches) if m.get("id") == match_id), None)
+    return None
 
-@api_router.post("/tournament/{tournament_id}/complete_groups", response_model=Tournament)
-async def complete_groups_and_draw_knockout(tournament_id: str):
-    tournament_data = await tournaments_collection.find_one({"_id": tournament_id})
-    if not tournament_data: raise HTTPException(status_code=404, detail="Tournoi non trouvé")
+def _swiss_add_points(players: List[dict], player: dict, delta: int):
+    player["points"] += delta
+    for opponent in player["opponents"]: _swiss_player(players, opponent)["buchholz"] += delta
+
+def _swiss_record_result(players: List[dict], p1: dict, p2: dict, score1: int, score2: int, sign: int):
+    # sign = +1 pour enregistrer un résultat, -1 pour l'annuler (correction de score)
+    for me, other, scored, conceded in ((p1, p2, score1, score2), (p2, p1, score2, score1)):
+        me["played"] += sign; me["goalsFor"] += sign * scored; me["goalsAgainst"] += sign * conceded
+        me["goalDiff"] = me["goalsFor"] - me["goalsAgainst"]
+        if scored > conceded: me["won"] += sign; _swiss_add_points(players, me, sign * 3)
+        elif scored < conceded: me["lost"] += sign
+        else: me["drawn"] += sign; _swiss_add_points(players, me, sign)
+
+def _swiss_sort_standings(tournament: dict):
+    tournament["swissPlayers"].sort(key=swiss_standings_key, reverse=True)
+    for i, p in enumerate(tournament["swissPlayers"]): p["groupPosition"] = i + 1
+
+def update_swiss_match_logic(tournament: dict, match: dict, scores: ScoreUpdateRequest) -> Set[str]:
+    if match.get("player2") is None: raise HTTPException(status_code=400, detail="Match exempt : aucun score à saisir")
+    if match.get("played") and match.get("score1") == scores.score1 and match.get("score2") == scores.score2: return set()
+    players = tournament["swissPlayers"]
+    p1 = _swiss_player(players, match["player1"]); p2 = _swiss_player(players, match["player2"])
+    if match.get("played"):
+        _swiss_record_result(players, p1, p2, match["score1"], match["score2"], -1)
+    else:
+        # Nouveaux adversaires : chacun récupère les points actuels de l'autre dans son Buchholz
+        p1["opponents"].append(p2["name"]); p1["buchholz"] += p2["points"]
+        p2["opponents"].append(p1["name"]); p2["buchholz"] += p1["points"]
+    _swiss_record_result(players, p1, p2, scores.score1, scores.score2, 1)
+    match["score1"] = scores.score1; match["score2"] = scores.score2; match["played"] = True
+    # Le classement (tri + groupPosition) est recalculé à l'appariement de chaque ronde, pas à chaque score
+    return {"swissMatches", "swissPlayers"}
+
+def generate_swiss_round_logic(tournament: dict) -> Set[str]:
+    if tournament.get("stage") != "swiss" or tournament.get("currentStep") != "swiss": raise HTTPException(status_code=400, detail="Action réservée à la phase suisse")
+    if not all(m["played"] for m in tournament.get("swissMatches", [])): raise HTTPException(status_code=400, detail="La ronde actuelle n'est pas terminée")
+    if tournament.get("swissRound", 0) >= tournament.get("swissTotalRounds", 0): raise HTTPException(status_code=400, detail="Toutes les rondes suisses ont été jouées")
+    players = tournament["swissPlayers"]
+    players_by_name = {p["name"]: p for p in players}
+    ranked = [p["name"] for p in sorted(players, key=swiss_standings_key, reverse=True)]
+    round_index = tournament.get("swissRound", 0)
+    new_matches = []
+    if len(ranked) % 2 == 1:
+        # Exempt : le moins bien classé n'ayant pas encore été exempté (victoire 3 points, sans buts)
+        bye_name = next((name for name in reversed(ranked) if players_by_name[name]["byes"] == 0), ranked[-1])
+        ranked.remove(bye_name)
+        bye_player = players_by_name[bye_name]
+        bye_player["byes"] += 1; bye_player["played"] += 1; bye_player["won"] += 1
+        _swiss_add_points(players, bye_player, 3)
+        new_matches.append(SwissMatch(round=round_index, player1=bye_name, player2=None, played=True))
+    opponents = {p["name"]: set(p["opponents"]) for p in players}
+    pairs = pair_swiss_players_logic(ranked, opponents)
+    rematches = sum(1 for p1, p2 in pairs if p2 in opponents[p1])
+    if rematches: logging.warning(f"Appariement suisse sans revanche impossible (ronde {round_index + 1}) : {rematches} revanche(s)")
+    for p1, p2 in pairs: new_matches.append(SwissMatch(round=round_index, player1=p1, player2=p2))
+    swiss_matches = tournament.setdefault("swissMatches", [])
+    for position, m in enumerate(new_matches, start=len(swiss_matches)): m.id = f"match_swiss_{position}_{uuid.uuid4()}"
+    swiss_matches.extend(m.model_dump() for m in new_matches)
+    tournament["swissRound"] = round_index + 1
+    _swiss_sort_standings(tournament)
+    return {"swissPlayers", "swissMatches", "swissRound"}
+
+# --- Logique des mutations (appliquée sur le document brut du tournoi) ---
+# Chaque fonction valide l'état AVANT de modifier le document, lève une HTTPException en cas d'erreur
+# et renvoie les champs de premier niveau modifiés (ensemble vide si le tournoi est inchangé).
+# Version et updatedAt sont gérés par l'appelant.
+
+def complete_groups_logic(tournament_data: dict) -> Set[str]:
     tournament = Tournament(**tournament_data)
-    if not all(m.played for g in tournament.groups for m in g.matches): raise HTTPException(status_code=400, detail="Tous les matchs de poule ne sont pas encore joués")
-    
-    qualified_entities = determine_qualifiers_logic(tournament.groups, len(tournament.players))
+    if tournament.stage == "swiss":
+        # Transition suisse -> tableau final : les mieux classés (points, Buchholz, diff., buts) se qualifient
+        if tournament.swissRound < tournament.swissTotalRounds or not all(m.played for m in tournament.swissMatches): raise HTTPException(status_code=400, detail="Toutes les rondes suisses ne sont pas encore jouées")
+        entities = tournament.swissPlayers
+        ranking = sorted(entities, key=lambda p: (p.points, p.buchholz, p.goalDiff, p.goalsFor), reverse=True)
+        for i, p in enumerate(ranking): p.groupPosition = i + 1
+        tournament.swissPlayers = ranking
+        qualified_entities = [p.name for p in ranking[:qualifier_target_logic(len(entities))]]
+    else:
+        if not all(m.played for g in tournament.groups for m in g.matches): raise HTTPException(status_code=400, detail="Tous les matchs de poule ne sont pas encore joués")
+        qualified_entities = determine_qualifiers_logic(tournament.groups, len(tournament.players))
+        entities = [p for g in tournament.groups for p in g.players]
     final_qualified_list = qualified_entities 
     if tournament.format == "2v2":
         # Logique 2v2 reshuffle (inchangée)
         previous_teams_sets = []
-        for g in tournament.groups:
-            for p in g.players:
-                if p.real_players: previous_teams_sets.append(set(p.real_players))
-                else:
-                    parts = p.name.split(' + ')
-                    if len(parts) == 2: previous_teams_sets.append(set(parts))
+        for p in entities:
+            if p.real_players: previous_teams_sets.append(set(p.real_players))
+            else:
+                parts = p.name.split(' + ')
+                if len(parts) == 2: previous_teams_sets.append(set(parts))
         individual_pool = []
-        all_stats_map = {p.name: p for g in tournament.groups for p in g.players}
+        all_stats_map = {p.name: p for p in entities}
         for team_name in qualified_entities:
             stats = all_stats_map.get(team_name)
             if stats and stats.real_players: individual_pool.extend(stats.real_players)
@@ -609,23 +1083,14 @@ async def complete_groups_and_draw_knockout(tournament_id: str):
                 if i+1 < len(individual_pool): new_teams.append(f"{individual_pool[i]} + {individual_pool[i+1]}")
                 else: new_teams.append(individual_pool[i])
         final_qualified_list = new_teams
-    tournament.qualifiedPlayers = final_qualified_list
-    tournament.currentStep = "qualified"
     is_2v2 = (tournament.format == "2v2")
     knockout_matches = generate_knockout_matches_logic(final_qualified_list, single_round=is_2v2)
-    tournament.knockoutMatches = knockout_matches
-    tournament.currentStep = "knockout"
-    tournament.updatedAt = datetime.now(timezone.utc)
-    update_data = {"$set": {"groups": [g.model_dump() for g in tournament.groups], "qualifiedPlayers": tournament.qualifiedPlayers, "knockoutMatches": [m.model_dump() for m in tournament.knockoutMatches], "currentStep": tournament.currentStep, "updatedAt": tournament.updatedAt}}
-    await tournaments_collection.update_one({"_id": tournament_id}, update_data)
-    res = await tournaments_collection.find_one({"_id": tournament_id}); res["_id"] = str(res["_id"])
-    return Tournament(**res)
+    changes = {"groups": [g.model_dump() for g in tournament.groups], "swissPlayers": [p.model_dump() for p in tournament.swissPlayers], "qualifiedPlayers": final_qualified_list, "knockoutMatches": [m.model_dump() for m in knockout_matches], "currentStep": "knockout"}
+    tournament_data.update(changes)
+    return set(changes)
 
-@api_router.post("/tournament/{tournament_id}/generate_next_round", response_model=Tournament)
-async def generate_next_round(tournament_id: str):
-    t_data = await tournaments_collection.find_one({"_id": tournament_id})
-    if not t_data: raise HTTPException(status_code=404, detail="Tournoi non trouvé")
-    tournament = Tournament(**t_data)
+def generate_next_round_logic(tournament_data: dict) -> Set[str]:
+    tournament = Tournament(**tournament_data)
     if tournament.format != "2v2": raise HTTPException(status_code=400, detail="Action réservée au mode 2v2")
     current_matches = tournament.knockoutMatches
     if not current_matches: raise HTTPException(status_code=400, detail="Aucun match en cours")
@@ -657,58 +1122,25 @@ async def generate_next_round(tournament_id: str):
         if len(loser_teams) == 2:
             new_matches.append(KnockoutMatch(id=f"match_third_place_{uuid.uuid4()}", round=next_round_index, matchIndex=1, player1=loser_teams[0], player2=loser_teams[1]))
     tournament.knockoutMatches.extend(new_matches)
-    tournament.updatedAt = datetime.now(timezone.utc)
-    await tournaments_collection.update_one({"_id": tournament_id}, {"$set": {"knockoutMatches": [m.model_dump() for m in tournament.knockoutMatches], "updatedAt": tournament.updatedAt}})
-    res = await tournaments_collection.find_one({"_id": tournament_id}); res["_id"] = str(res["_id"])
-    return Tournament(**res)
+    tournament_data["knockoutMatches"] = [m.model_dump() for m in tournament.knockoutMatches]
+    return {"knockoutMatches"}
 
-@api_router.delete("/tournament/{tournament_id}", status_code=204)
-async def delete_tournament(tournament_id: str, current_user: UserInDB = Depends(get_current_user)):
-    tournament_data = await tournaments_collection.find_one({"_id": tournament_id})
-    if not tournament_data: raise HTTPException(status_code=404, detail="Tournoi non trouvé")
-    if tournament_data.get("owner_username") != current_user.username and current_user.role != "super_admin":
-        raise HTTPException(status_code=403, detail="Permission refusée.")
-    await tournaments_collection.delete_one({"_id": tournament_id})
-    logging.info(f"Tournoi {tournament_id} supprimé par {current_user.username}")
-    return 
-
-@api_router.get("/tournaments/public", response_model=List[Tournament])
-async def get_public_tournaments():
-    tournaments = await tournaments_collection.find({}, sort=[("createdAt", -1)]).limit(20).to_list(20)
-    for t in tournaments: t["_id"] = str(t["_id"])
-    return tournaments
-
-@api_router.get("/tournaments/my-tournaments", response_model=List[Tournament])
-async def get_my_tournaments(current_user: UserInDB = Depends(get_current_user)):
-    tournaments = await tournaments_collection.find({"owner_username": current_user.username}, sort=[("createdAt", -1)]).to_list(1000)
-    for t in tournaments: t["_id"] = str(t["_id"])
-    return tournaments
-
-@api_router.get("/tournament/{tournament_id}", response_model=Tournament)
-async def get_tournament(tournament_id: str):
-    t = await tournaments_collection.find_one({"_id": tournament_id})
-    if t: t["_id"] = str(t["_id"]); return Tournament(**t)
-    raise HTTPException(status_code=404, detail=f"Tournoi '{tournament_id}' non trouvé")
-
-@api_router.post("/tournament/{tournament_id}/match/{match_id}/score", response_model=Tournament)
-async def update_match_score(tournament_id: str, match_id: str, scores: ScoreUpdateRequest):
-    t = await tournaments_collection.find_one({"_id": tournament_id})
-    if not t: raise HTTPException(status_code=404, detail="Tournoi non trouvé")
-    tournament = t
+def update_match_score_logic(tournament: dict, match_id: str, scores: ScoreUpdateRequest) -> Set[str]:
     match_found = False
+    swiss_match = _find_swiss_match(tournament, match_id)
+    if swiss_match: return update_swiss_match_logic(tournament, swiss_match, scores)
     # ... (Logique Score update identique à la V4 mais avec ScoreUpdateRequest validé)
     if tournament.get("groups"):
         for group in tournament["groups"]:
             for match in group.get("matches", []):
                 if match.get("id") == match_id:
                     if match.get("played") and match.get("score1") == scores.score1 and match.get("score2") == scores.score2:
-                        tournament["_id"] = str(tournament["_id"]); return Tournament(**tournament)
-                    match["score1"] = scores.score1; match["score2"] = scores.score2; match["played"] = True; match_found = True
+                        return set()
+                    match["score1"] = scores.score1; match["score2"] = scores.score2; match["played"] = True
                     updated_standings = update_group_standings_logic(Group(**group))
                     group["players"] = [p.model_dump() for p in updated_standings]
-                    break
-            if match_found: break
-    if not match_found and tournament.get("knockoutMatches"):
+                    return {"groups"}
+    if tournament.get("knockoutMatches"):
         for match in tournament["knockoutMatches"]:
              if match.get("id") == match_id:
                 match["score1"] = scores.score1; match["score2"] = scores.score2; match["played"] = True
@@ -752,23 +1184,378 @@ async def update_match_score(tournament_id: str, match_id: str, scores: ScoreUpd
                          if len(matches_in_this_round) == 1: tournament["winner"] = winner; tournament["currentStep"] = "finished"
                 break
     if not match_found: raise HTTPException(status_code=404, detail=f"Match '{match_id}' non trouvé")
-    tournament["updatedAt"] = datetime.now(timezone.utc)
-    await tournaments_collection.update_one({"_id": tournament_id}, {"$set": tournament})
-    res = await tournaments_collection.find_one({"_id": tournament_id}); res["_id"] = str(res["_id"])
-    return Tournament(**res)
+    return {"knockoutMatches", "winner", "thirdPlace", "currentStep"}
 
-@api_router.post("/tournament/{tournament_id}/redraw_knockout", response_model=Tournament)
-async def redraw_knockout_bracket(tournament_id: str):
-    t = await tournaments_collection.find_one({"_id": tournament_id})
-    if not t: raise HTTPException(status_code=404, detail="Tournoi non trouvé")
-    tournament = Tournament(**t)
+def redraw_knockout_logic(tournament_data: dict) -> Set[str]:
+    tournament = Tournament(**tournament_data)
     new_km = generate_knockout_matches_logic(tournament.qualifiedPlayers, single_round=(tournament.format=="2v2"))
-    tournament.knockoutMatches = new_km
-    tournament.updatedAt = datetime.now(timezone.utc)
-    update_data = {"$set": {"knockoutMatches": [m.model_dump() for m in new_km], "updatedAt": tournament.updatedAt}}
-    await tournaments_collection.update_one({"_id": tournament_id}, update_data)
-    res = await tournaments_collection.find_one({"_id": tournament_id}); res["_id"] = str(res["_id"])
-    return Tournament(**res)
+    tournament_data["knockoutMatches"] = [m.model_dump() for m in new_km]
+    return {"knockoutMatches"}
+
+# --- Réponses Delta (JSON Patch RFC 6902) ---
+# Opt-in : "Accept: application/json-patch+json" ou "?delta=1", avec la version connue du client
+# dans "X-Base-Version" (ou "?base_version="). Si la version ne correspond pas, on renvoie le tournoi complet.
+
+def _escape_json_pointer(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+def compute_json_patch(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+    ops = []
+    if isinstance(old, dict):
+        for key in old:
+            if key not in new: ops.append({"op": "remove", "path": f"{path}/{_escape_json_pointer(key)}"})
+        for key, value in new.items():
+            child_path = f"{path}/{_escape_json_pointer(key)}"
+            if key not in old: ops.append({"op": "add", "path": child_path, "value": value})
+            else: ops.extend(compute_json_patch(old[key], value, child_path))
+    elif isinstance(old, list):
+        common = min(len(old), len(new))
+        for i in range(common): ops.extend(compute_json_patch(old[i], new[i], f"{path}/{i}"))
+        for i in range(common, len(new)): ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        # Suppression depuis la fin pour garder des indices valides
+        for i in range(len(old) - 1, common - 1, -1): ops.append({"op": "remove", "path": f"{path}/{i}"})
+    elif old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+    return ops
+
+def wants_delta_response(request: Request) -> bool:
+    if JSON_PATCH_MEDIA_TYPE in request.headers.get("accept", ""): return True
+    return request.query_params.get("delta", "").lower() in ("1", "true")
+
+def get_client_base_version(request: Request) -> Optional[int]:
+    raw = request.headers.get("x-base-version") or request.query_params.get("base_version")
+    try: return int(raw) if raw is not None else None
+    except ValueError: return None
+
+def build_tournament_response(request: Request, previous: Optional[Tournament], tournament: Tournament):
+    if previous is None or not wants_delta_response(request): return tournament
+    if get_client_base_version(request) != previous.version: return tournament
+    patch = compute_json_patch(previous.model_dump(mode="json", by_alias=True), tournament.model_dump(mode="json", by_alias=True))
+    return JSONResponse(content=patch, media_type=JSON_PATCH_MEDIA_TYPE, headers={"X-Tournament-Version": str(tournament.version)})
+
+# --- Acteur mono-écrivain par tournoi ---
+# Toutes les mutations d'un tournoi passent par une file asyncio propre à ce tournoi : elles sont appliquées
+# dans l'ordre sur une copie chaude en mémoire, et les rafales sont regroupées en une seule écriture Mongo
+# ($set des seuls champs modifiés, validation Pydantic une fois par lot). Les tournois inactifs sont déchargés
+# après TOURNAMENT_ACTOR_IDLE_SECONDS.
+# L'écriture est conditionnée à la version chargée : si un autre processus (autre worker uvicorn) a modifié le
+# tournoi entre-temps, la copie chaude est rechargée et le lot rejoué au lieu d'écraser ses écritures.
+# Une commande en échec est annulée seule : rechargement de l'état d'avant le lot, puis nouvelle application
+# des autres commandes.
+
+# Les admins authentifiés transmettent leur session causale : le chargement et l'écriture du lot se font dans une
+# session avancée à leur clusterTime, puis leurs sessions avancent jusqu'à l'operationTime de l'écriture du lot.
+
+class QueuedCommand(NamedTuple):
+    command: Callable[[dict], Set[str]]
+    future: asyncio.Future
+    enqueued_at: float
+    want_before: bool
+    session: Any = None # Session causale de l'admin à l'origine de la commande (None = anonyme)
+    profile_stats: tuple = () # Compteurs Mongo de la requête profilée à l'origine de la commande
+
+class TournamentActor:
+    def __init__(self, tournament_id: str):
+        self.tournament_id = tournament_id
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.doc: Optional[dict] = None
+        self.snapshot: Optional[Tournament] = None # Dernier état validé de self.doc (None = à revalider)
+        self.commands_applied = 0
+        self.writes = 0
+        self.conflicts = 0
+        self.rollbacks = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_activity = datetime.now(timezone.utc)
+        self.task = asyncio.create_task(self._run())
+
+    async def submit(self, command, want_before: bool = False, session=None):
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait(QueuedCommand(command, future, time.perf_counter(), want_before, session, current_profile_stats.get()))
+        return await future
+
+    def unload(self):
+        # La copie chaude est rechargée depuis Mongo à la prochaine commande
+        self.doc = None
+        self.snapshot = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tournamentId": self.tournament_id,
+            "loaded": self.doc is not None,
+            "queueDepth": self.queue.qsize(),
+            "commandsApplied": self.commands_applied,
+            "writes": self.writes,
+            "conflicts": self.conflicts,
+            "rollbacks": self.rollbacks,
+            "avgWaitMs": round(self.total_wait / self.commands_applied * 1000, 3) if self.commands_applied else 0.0,
+            "maxWaitMs": round(self.max_wait * 1000, 3),
+            "lastActivity": self.last_activity,
+        }
+
+    async def _run(self):
+        while True:
+            try:
+                first = await asyncio.wait_for(self.queue.get(), timeout=TOURNAMENT_ACTOR_IDLE_SECONDS)
+            except asyncio.TimeoutError:
+                # Aucun await entre ce test et le retrait : aucune commande ne peut être perdue
+                if self.queue.empty():
+                    tournament_actors.pop(self.tournament_id, None)
+                    return
+                continue
+            batch = [first]
+            while not self.queue.empty() and len(batch) < TOURNAMENT_ACTOR_MAX_BATCH:
+                batch.append(self.queue.get_nowait())
+            try:
+                await self._process(batch)
+            except Exception as e:
+                # Erreur hors commande (Mongo indisponible...) : le lot entier échoue
+                logging.error(f"Acteur {self.tournament_id}: erreur inattendue: {e}", exc_info=True)
+                self.unload()
+                for item in batch:
+                    if not item.future.done(): item.future.set_exception(HTTPException(status_code=500, detail="Erreur interne du serveur"))
+
+    async def _load(self, session=None):
+        self.doc = await tournaments_collection.find_one({"_id": self.tournament_id}, session=session)
+        if self.doc: self.doc["_id"] = str(self.doc["_id"])
+        self.snapshot = None
+
+    def _version_filter(self) -> Dict[str, Any]:
+        # Condition d'écriture : la version chargée (tournois antérieurs au champ version : aucune version en base)
+        if "version" not in self.doc: return {"_id": self.tournament_id, "version": {"$exists": False}}
+        return {"_id": self.tournament_id, "version": self.doc["version"]}
+
+    def _apply(self, batch, failed: Dict[int, Exception], strict: bool = False):
+        # Applique les commandes non encore en échec. Renvoie (champs modifiés, True si une commande vient d'échouer).
+        # strict : validation après chaque commande, pour isoler celle qui produit un tournoi invalide.
+        touched = set()
+        for index, item in enumerate(batch):
+            if index in failed: continue
+            try:
+                changed = item.command(self.doc)
+                if strict and changed: Tournament(**self.doc)
+            except Exception as e:
+                if not isinstance(e, HTTPException):
+                    logging.error(f"Acteur {self.tournament_id}: commande en échec: {e}", exc_info=True)
+                    e = HTTPException(status_code=500, detail="Erreur interne du serveur")
+                failed[index] = e
+                return touched, True
+            if changed:
+                touched |= set(changed)
+                self.doc["version"] = self.doc.get("version", 0) + 1
+        return touched, False
+
+    async def _process(self, batch):
+        # La tâche de l'acteur a hérité du contexte de la requête qui l'a créée : le temps Mongo du lot
+        # est crédité aux requêtes profilées du lot, et à elles seules.
+        token = current_profile_stats.set(tuple(s for item in batch for s in item.profile_stats))
+        try:
+            await self._process_in_session(batch)
+        finally:
+            current_profile_stats.reset(token)
+
+    async def _process_in_session(self, batch):
+        requester_sessions = [item.session for item in batch if item.session is not None]
+        if not requester_sessions: return await self._process_batch(batch, None)
+        async with await client.start_session(causal_consistency=True) as session:
+            for requester in requester_sessions:
+                if requester.cluster_time: session.advance_cluster_time(requester.cluster_time)
+                if requester.operation_time: session.advance_operation_time(requester.operation_time)
+            await self._process_batch(batch, session)
+
+    async def _process_batch(self, batch, session):
+        self.last_activity = datetime.now(timezone.utc)
+        for item in batch:
+            wait = time.perf_counter() - item.enqueued_at
+            self.commands_applied += 1; self.total_wait += wait; self.max_wait = max(self.max_wait, wait)
+        want_before = any(item.want_before for item in batch)
+        failed: Dict[int, Exception] = {}
+        conflicts = 0
+        strict = False
+        # Copie chaude chargée avant ce lot : un autre processus a pu modifier le tournoi depuis
+        fresh = self.doc is None
+        if fresh: await self._load(session)
+        while self.doc is not None:
+            # Les réponses delta partent de l'état d'avant le lot (version connue des clients concurrents)
+            if want_before and self.snapshot is None: self.snapshot = Tournament(**self.doc)
+            before = self.snapshot
+            version_filter = self._version_filter()
+            touched, rolled_back = self._apply(batch, failed, strict)
+            if rolled_back:
+                self.rollbacks += 1
+                # Échec sur une copie possiblement périmée : la commande est retentée une fois sur l'état rechargé.
+                # Ensuite, chaque annulation écarte définitivement une commande : la boucle se termine.
+                if not fresh: failed.clear()
+                await self._load(session); fresh = True
+                continue
+            if not touched:
+                # Rien à écrire : la réponse ne doit pas renvoyer une copie périmée
+                if fresh: break
+                await self._load(session); fresh = True
+                continue
+            self.doc["updatedAt"] = datetime.now(timezone.utc)
+            try:
+                after = Tournament(**self.doc) # Seule validation complète du lot
+            except Exception:
+                # Tournoi invalide après le lot : nouvelle application commande par commande pour écarter la fautive
+                strict = True
+                self.rollbacks += 1
+                await self._load(session); fresh = True
+                continue
+            fields = {k: self.doc[k] for k in touched | {"version", "updatedAt"} if k in self.doc}
+            res = await tournaments_collection.update_one(version_filter, {"$set": fields}, session=session)
+            self.writes += 1
+            if res.matched_count:
+                self.snapshot = after
+                break
+            # Tournoi modifié par un autre processus (ou supprimé) : rechargement puis nouvelle application du lot
+            self.conflicts += 1; conflicts += 1
+            if conflicts > TOURNAMENT_ACTOR_MAX_CONFLICTS:
+                self.unload()
+                for item in batch:
+                    if not item.future.done(): item.future.set_exception(HTTPException(status_code=409, detail="Tournoi modifié simultanément, réessayez"))
+                return
+            await self._load(session); fresh = True
+        if self.doc is None:
+            for item in batch:
+                if not item.future.done(): item.future.set_exception(HTTPException(status_code=404, detail="Tournoi non trouvé"))
+            return
+        if self.snapshot is None: self.snapshot = Tournament(**self.doc)
+        if session is not None and session.operation_time:
+            # Avant de répondre : les lectures suivantes des admins verront l'écriture du lot
+            for item in batch:
+                if item.session is None: continue
+                item.session.advance_cluster_time(session.cluster_time)
+                item.session.advance_operation_time(session.operation_time)
+        for index, item in enumerate(batch):
+            if item.future.done(): continue
+            if index in failed: item.future.set_exception(failed[index])
+            else: item.future.set_result((before if item.want_before else None, self.snapshot))
+
+tournament_actors: Dict[str, TournamentActor] = {}
+
+async def submit_tournament_command(tournament_id: str, command, want_before: bool = False, session=None):
+    actor = tournament_actors.get(tournament_id)
+    if actor is None:
+        actor = TournamentActor(tournament_id)
+        tournament_actors[tournament_id] = actor
+    return await actor.submit(command, want_before, session)
+
+def evict_tournament_actor(tournament_id: str):
+    actor = tournament_actors.get(tournament_id)
+    if actor: actor.unload()
+
+# --- Routes API (Tournoi) ---
+
+@api_router.post("/tournament", response_model=Tournament, status_code=201)
+async def create_tournament(
+    request: TournamentCreateRequest, 
+    current_user: UserInDB = Depends(get_current_user),
+    session = Depends(get_admin_session)
+): 
+    # Les données sont validées et nettoyées par Pydantic (TournamentCreateRequest)
+    player_names = request.playerNames
+    
+    if request.format == "2v2" and len(player_names) % 2 != 0: 
+        raise HTTPException(status_code=400, detail="Pour un tournoi 2v2, le nombre de joueurs doit être pair.")
+    
+    if request.stage == "swiss":
+        swiss_players, total_rounds = create_swiss_logic(player_names, request.format or "1v1", request.swissRounds)
+        new_tournament = Tournament(
+            name=request.tournamentName,
+            players=player_names,
+            currentStep="swiss",
+            stage="swiss",
+            swissPlayers=swiss_players,
+            swissTotalRounds=total_rounds,
+            owner_username=current_user.username,
+            format=request.format or "1v1"
+        )
+    else:
+        generated_groups = create_groups_logic(player_names, request.numGroups, request.format or "1v1")
+        
+        new_tournament = Tournament(
+            name=request.tournamentName, # Déjà nettoyé
+            players=player_names, 
+            currentStep="groups", 
+            groups=generated_groups, 
+            owner_username=current_user.username, 
+            format=request.format or "1v1"
+        )
+    
+    t_dict = new_tournament.model_dump(by_alias=True)
+    t_dict["createdAt"] = new_tournament.createdAt
+    t_dict["updatedAt"] = new_tournament.updatedAt
+    if new_tournament.stage == "swiss": generate_swiss_round_logic(t_dict) # Première ronde
+    
+    res = await tournaments_collection.insert_one(t_dict, session=session)
+    created = await tournaments_collection.find_one({"_id": res.inserted_id}, session=session)
+    if created: created["_id"] = str(created["_id"])
+    logging.info(f"Tournoi créé par {current_user.username} (Audit Log)")
+    return Tournament(**created)
+
+@api_router.post("/tournament/{tournament_id}/complete_groups", response_model=Tournament)
+async def complete_groups_and_draw_knockout(tournament_id: str, request: Request, session = Depends(get_optional_admin_session)):
+    before, after = await submit_tournament_command(tournament_id, complete_groups_logic, wants_delta_response(request), session)
+    return build_tournament_response(request, before, after)
+
+@api_router.post("/tournament/{tournament_id}/swiss/next_round", response_model=Tournament)
+async def generate_swiss_round(tournament_id: str, request: Request, session = Depends(get_optional_admin_session)):
+    before, after = await submit_tournament_command(tournament_id, generate_swiss_round_logic, wants_delta_response(request), session)
+    return build_tournament_response(request, before, after)
+
+@api_router.post("/tournament/{tournament_id}/generate_next_round", response_model=Tournament)
+async def generate_next_round(tournament_id: str, request: Request, session = Depends(get_optional_admin_session)):
+    before, after = await submit_tournament_command(tournament_id, generate_next_round_logic, wants_delta_response(request), session)
+    return build_tournament_response(request, before, after)
+
+@api_router.delete("/tournament/{tournament_id}", status_code=204)
+async def delete_tournament(tournament_id: str, current_user: UserInDB = Depends(get_current_user), session = Depends(get_admin_session)):
+    tournament_data = await tournaments_collection.find_one({"_id": tournament_id}, session=session)
+    if not tournament_data: raise HTTPException(status_code=404, detail="Tournoi non trouvé")
+    if tournament_data.get("owner_username") != current_user.username and current_user.role != "super_admin":
+        raise HTTPException(status_code=403, detail="Permission refusée.")
+    await tournaments_collection.delete_one({"_id": tournament_id}, session=session)
+    evict_tournament_actor(tournament_id)
+    logging.info(f"Tournoi {tournament_id} supprimé par {current_user.username}")
+    return 
+
+@api_router.get("/tournaments/public", response_model=List[Tournament])
+async def get_public_tournaments():
+    tournaments = await public_tournaments_collection.find({}, sort=[("createdAt", -1)]).limit(20).to_list(20)
+    for t in tournaments: t["_id"] = str(t["_id"])
+    return tournaments
+
+@api_router.get("/tournaments/my-tournaments", response_model=List[Tournament])
+async def get_my_tournaments(current_user: UserInDB = Depends(get_current_user), session = Depends(get_admin_session)):
+    tournaments = await tournaments_collection.find({"owner_username": current_user.username}, sort=[("createdAt", -1)], session=session).to_list(1000)
+    for t in tournaments: t["_id"] = str(t["_id"])
+    return tournaments
+
+@api_router.get("/tournament/{tournament_id}", response_model=Tournament)
+async def get_tournament(tournament_id: str, session = Depends(get_optional_admin_session)):
+    # Spectateurs : secondaires (lecture éventuellement en retard). Admin connecté : primaire, dans sa session causale.
+    if session is None: t = await public_tournaments_collection.find_one({"_id": tournament_id})
+    else: t = await tournaments_collection.find_one({"_id": tournament_id}, session=session)
+    if t: t["_id"] = str(t["_id"]); return Tournament(**t)
+    raise HTTPException(status_code=404, detail=f"Tournoi '{tournament_id}' non trouvé")
+
+@api_router.post("/tournament/{tournament_id}/match/{match_id}/score", response_model=Tournament)
+async def update_match_score(tournament_id: str, match_id: str, scores: ScoreUpdateRequest, request: Request, session = Depends(get_optional_admin_session)):
+    command = lambda t: update_match_score_logic(t, match_id, scores)
+    before, after = await submit_tournament_command(tournament_id, command, wants_delta_response(request), session)
+    return build_tournament_response(request, before, after)
+
+@api_router.post("/tournament/{tournament_id}/redraw_knockout", response_model=Tournament)
+async def redraw_knockout_bracket(tournament_id: str, request: Request, session = Depends(get_optional_admin_session)):
+    before, after = await submit_tournament_command(tournament_id, redraw_knockout_logic, wants_delta_response(request), session)
+    return build_tournament_response(request, before, after)
+
+@api_router.get("/admin/tournament-actors")
+async def get_tournament_actors_stats(current_user: UserInDB = Depends(get_current_super_admin)):
+    return [actor.stats() for actor in tournament_actors.values()]
 
 # --- Status & Root ---
 @app.get("/") 
@@ -794,6 +1581,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], 
     allow_headers=["*"], 
+    expose_headers=["X-Tournament-Version", "X-Total-Count", "X-Next-Cursor", "X-Profile-Id"],
 )
 
 logging.basicConfig(level=logging.INFO)
@@ -802,9 +1590,10 @@ async def startup():
     try: 
         await client.admin.command('ping')
         logging.info(f"Connected to DB: {db_name}")
+        await ensure_user_indexes()
         # (Migration Logic from previous step retained here...)
-        users_count = await users_collection.count_documents({})
-        if users_count > 0:
+        any_user = await users_collection.find_one({}, projection={"_id": 1})
+        if any_user:
             await users_collection.update_many({"status": {"$exists": False}}, {"$set": {"status": "active", "role": "admin"}})
             super_admin = await users_collection.find_one({"role": "super_admin"})
             if not super_admin:
@@ -812,6 +1601,9 @@ async def startup():
                 if first_user:
                     await users_collection.update_one({"_id": first_user["_id"]}, {"$set": {"role": "super_admin", "status": "active"}})
                     logging.info(f"MIGRATION: {first_user['username']} promu Super Admin.")
+            # Bases antérieures au marqueur d'amorçage : le premier inscrit n'est plus détecté par comptage
+            await meta_collection.update_one({"_id": BOOTSTRAP_MARKER_ID}, {"$setOnInsert": {"createdAt": datetime.now(timezone.utc)}}, upsert=True)
+        await refresh_user_counters()
     except Exception as e: 
         logging.error(f"DB Connection/Migration Error: {e}")
 
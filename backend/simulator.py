@@ -0,0 +1,266 @@
+# Fichier: backend/simulator.py
+# Simulateur de tournois "headless" : aucun HTTP, aucun Mongo.
+# Rejoue la même logique que les routes (poules ou rondes suisses, scores, qualification, reshuffle 2v2, tableau final)
+# avec des résultats aléatoires reproductibles, valide le document (Tournament) après chaque phase comme l'acteur,
+# vérifie les invariants et mesure le débit.
+#
+# Exemple : python simulator.py --count 100000 --workers 8 --seed 42
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple
+
+from pydantic import ValidationError
+
+from server import (
+    HTTPException,
+    Tournament,
+    ScoreUpdateRequest,
+    create_groups_logic,
+    create_swiss_logic,
+    generate_swiss_round_logic,
+    update_match_score_logic,
+    complete_groups_logic,
+    generate_next_round_logic,
+)
+
+FORMATS = ["1v1", "2v2"]
+STAGES = ["groups", "swiss"]
+MIN_PLAYERS = 4
+MAX_PLAYERS = 64
+SWISS_LARGE_SIZES = [128, 256, 512, 1024, 2048] # Couverts uniquement avec --include-large
+PHASES = ["draw", "first_stage_scores", "swiss_pairing", "qualification", "knockout", "validation", "checks"]
+MAX_KNOCKOUT_STEPS = 64 # Garde-fou contre un tableau bloqué
+
+# --- Configurations couvertes ---
+
+def supported_configs(stages: List[str], formats: List[str], include_large: bool = False) -> List[Tuple[str, str, int]]:
+    configs = []
+    for stage in stages:
+        sizes = list(range(MIN_PLAYERS, MAX_PLAYERS + 1))
+        if stage == "swiss" and include_large: sizes += SWISS_LARGE_SIZES
+        for fmt in formats:
+            for n in sizes:
+                if fmt == "2v2" and n % 2 != 0: continue
+                configs.append((stage, fmt, n))
+    return configs
+
+# --- Simulation d'un tournoi ---
+
+def apply_command(doc: dict, command) -> None:
+    # Même contrat que l'acteur de tournoi : la version n'avance que si le tournoi a changé
+    if command(doc): doc["version"] = doc.get("version", 0) + 1
+
+def play_match(doc: dict, match_id: str, allow_draw: bool) -> None:
+    score1 = random.randint(0, 5); score2 = random.randint(0, 5)
+    if not allow_draw and score1 == score2: score2 += 1
+    scores = ScoreUpdateRequest(score1=score1, score2=score2)
+    apply_command(doc, lambda t: update_match_score_logic(t, match_id, scores))
+
+def team_members(name: str) -> List[str]:
+    return name.split(' + ')
+
+def check_document(doc: dict, phase: str, violations: List[str], timings: Dict[str, float]) -> None:
+    # Même validation que l'acteur de tournoi avant chaque écriture : un document refusé ici serait rejeté par les routes
+    start = time.perf_counter()
+    try: Tournament(**doc)
+    except ValidationError as e:
+        error = e.errors()[0]
+        violations.append(f"{phase}: document invalide ({'.'.join(str(part) for part in error['loc'])}: {error['type']})")
+    timings["validation"] += time.perf_counter() - start
+
+def check_group_standings(doc: dict, violations: List[str]) -> None:
+    for group in doc["groups"]:
+        players = group["players"]
+        played_matches = sum(1 for m in group["matches"] if m["played"])
+        if sum(p["played"] for p in players) != 2 * played_matches: violations.append("poule: total de matchs joués incohérent")
+        if sum(p["won"] for p in players) != sum(p["lost"] for p in players): violations.append("poule: victoires != défaites")
+        if sum(p["goalsFor"] for p in players) != sum(p["goalsAgainst"] for p in players): violations.append("poule: buts pour != buts contre")
+        for p in players:
+            if p["points"] != 3 * p["won"] + p["drawn"]: violations.append("poule: points incohérents")
+            if p["played"] != p["won"] + p["drawn"] + p["lost"]: violations.append("poule: bilan incohérent")
+            if p["goalDiff"] != p["goalsFor"] - p["goalsAgainst"]: violations.append("poule: différence de buts incohérente")
+        if sorted(p["groupPosition"] for p in players) != list(range(1, len(players) + 1)): violations.append("poule: positions invalides")
+
+def check_swiss(doc: dict, violations: List[str]) -> None:
+    players = doc["swissPlayers"]
+    points = {p["name"]: p["points"] for p in players}
+    for p in players:
+        if len(set(p["opponents"])) != len(p["opponents"]): violations.append("suisse: revanche")
+        if p["buchholz"] != sum(points[o] for o in p["opponents"]): violations.append("suisse: Buchholz incrémental incohérent")
+        if p["points"] != 3 * p["won"] + p["drawn"]: violations.append("suisse: points incohérents")
+        if p["played"] != doc["swissRound"]: violations.append("suisse: nombre de matchs joués incohérent")
+        if p["byes"] > 1: violations.append("suisse: exempté plusieurs fois")
+    for round_index in range(doc["swissRound"]):
+        names = [n for m in doc["swissMatches"] if m["round"] == round_index for n in (m["player1"], m["player2"]) if n]
+        if sorted(names) != sorted(points): violations.append("suisse: ronde incomplète ou joueur apparié deux fois")
+
+def check_2v2_reshuffle(doc: dict, violations: List[str]) -> None:
+    entities = [p for g in doc["groups"] for p in g["players"]] + doc["swissPlayers"]
+    previous_pairs = {frozenset(team_members(p["name"])) for p in entities if " + " in p["name"]}
+    individuals = []
+    for team in doc["qualifiedPlayers"]:
+        members = team_members(team)
+        individuals.extend(members)
+        if len(members) == 2 and frozenset(members) in previous_pairs: violations.append("2v2: coéquipiers répétés après reshuffle")
+    if len(individuals) != len(set(individuals)): violations.append("2v2: joueur qualifié dans plusieurs équipes")
+
+def check_knockout(doc: dict, players: List[str], violations: List[str]) -> None:
+    rounds: Dict[int, List[str]] = {}
+    for m in doc["knockoutMatches"]:
+        for side in (m["player1"], m["player2"]):
+            if side: rounds.setdefault(m["round"], []).extend(team_members(side) if doc["format"] == "2v2" else [side])
+    for names in rounds.values():
+        if len(names) != len(set(names)): violations.append("tableau: joueur présent deux fois dans un même tour")
+    winner = doc.get("winner")
+    if not winner or doc.get("currentStep") != "finished": violations.append("tableau: pas de vainqueur unique")
+    elif not set(team_members(winner) if doc["format"] == "2v2" else [winner]) <= set(players): violations.append("tableau: vainqueur inconnu")
+
+def play_group_stage(doc: dict, timings: Dict[str, float]) -> None:
+    start = time.perf_counter()
+    for match_id in [m["id"] for g in doc["groups"] for m in g["matches"]]:
+        play_match(doc, match_id, allow_draw=True)
+    timings["first_stage_scores"] += time.perf_counter() - start
+
+def play_swiss_stage(doc: dict, timings: Dict[str, float]) -> None:
+    while True:
+        start = time.perf_counter()
+        for match_id in [m["id"] for m in doc["swissMatches"] if not m["played"]]:
+            play_match(doc, match_id, allow_draw=True)
+        timings["first_stage_scores"] += time.perf_counter() - start
+        if doc["swissRound"] >= doc["swissTotalRounds"]: return
+        start = time.perf_counter()
+        apply_command(doc, generate_swiss_round_logic)
+        timings["swiss_pairing"] += time.perf_counter() - start
+
+def simulate_tournament(stage: str, fmt: str, num_players: int, seed: int) -> Tuple[Dict[str, float], List[str]]:
+    random.seed(seed)
+    timings = dict.fromkeys(PHASES, 0.0)
+    violations: List[str] = []
+    players = [f"J{i}" for i in range(num_players)]
+
+    start = time.perf_counter()
+    if stage == "swiss":
+        # Même séquence que create_tournament : entités, puis appariement de la première ronde
+        swiss_players, total_rounds = create_swiss_logic(players, fmt)
+        doc = Tournament(name=f"Simulation {seed}", players=players, currentStep="swiss", stage="swiss", swissPlayers=swiss_players, swissTotalRounds=total_rounds, format=fmt).model_dump(by_alias=True)
+        generate_swiss_round_logic(doc)
+    else:
+        groups = create_groups_logic(players, None, fmt)
+        doc = Tournament(name=f"Simulation {seed}", players=players, currentStep="groups", groups=groups, format=fmt).model_dump(by_alias=True)
+    timings["draw"] = time.perf_counter() - start
+
+    check_document(doc, "tirage", violations, timings)
+    if stage == "swiss": play_swiss_stage(doc, timings)
+    else: play_group_stage(doc, timings)
+    check_document(doc, "première phase", violations, timings)
+
+    start = time.perf_counter()
+    try: apply_command(doc, complete_groups_logic)
+    except HTTPException as e:
+        violations.append(f"qualification: {e.detail}")
+        return timings, violations
+    timings["qualification"] = time.perf_counter() - start
+    check_document(doc, "qualification", violations, timings)
+
+    start = time.perf_counter()
+    for _ in range(MAX_KNOCKOUT_STEPS):
+        playable = [m["id"] for m in doc["knockoutMatches"] if m["player1"] and m["player2"] and not m["played"]]
+        if playable:
+            for match_id in playable: play_match(doc, match_id, allow_draw=False)
+            continue
+        if doc.get("winner"): break
+        if fmt != "2v2":
+            violations.append("tableau: bloqué sans vainqueur"); break
+        try: apply_command(doc, generate_next_round_logic)
+        except HTTPException as e:
+            violations.append(f"tableau: {e.detail}"); break
+    timings["knockout"] = time.perf_counter() - start
+    check_document(doc, "tableau", violations, timings)
+
+    start = time.perf_counter()
+    if stage == "swiss": check_swiss(doc, violations)
+    else: check_group_standings(doc, violations)
+    if fmt == "2v2": check_2v2_reshuffle(doc, violations)
+    check_knockout(doc, players, violations)
+    timings["checks"] = time.perf_counter() - start
+    return timings, violations
+
+# --- Exécution par lots (un lot par processus) ---
+
+def run_batch(start: int, end: int, base_seed: int, configs: List[Tuple[str, str, int]]) -> Dict[str, Any]:
+    timings = dict.fromkeys(PHASES, 0.0)
+    failures: Counter = Counter()
+    failing_examples: Dict[str, str] = {}
+    for index in range(start, end):
+        stage, fmt, num_players = configs[index % len(configs)]
+        seed = base_seed + index
+        t_timings, violations = simulate_tournament(stage, fmt, num_players, seed)
+        for phase, value in t_timings.items(): timings[phase] += value
+        for v in set(violations):
+            failures[v] += 1
+            failing_examples.setdefault(v, f"phase={stage} format={fmt} joueurs={num_players} seed={seed}")
+    return {"count": end - start, "timings": timings, "failures": failures, "examples": failing_examples}
+
+def run_simulation(count: int, workers: int, base_seed: int, configs: List[Tuple[str, str, int]], chunk_size: int = 500) -> Dict[str, Any]:
+    report = {"count": 0, "timings": dict.fromkeys(PHASES, 0.0), "failures": Counter(), "examples": {}}
+    chunks = [(s, min(s + chunk_size, count)) for s in range(0, count, chunk_size)]
+    start = time.perf_counter()
+    if workers <= 1:
+        partials = (run_batch(s, e, base_seed, configs) for s, e in chunks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        partials = executor.map(run_batch, *zip(*[(s, e, base_seed, configs) for s, e in chunks]))
+    for partial in partials:
+        report["count"] += partial["count"]
+        for phase, value in partial["timings"].items(): report["timings"][phase] += value
+        report["failures"].update(partial["failures"])
+        for k, v in partial["examples"].items(): report["examples"].setdefault(k, v)
+    if workers > 1: executor.shutdown()
+    report["elapsed"] = time.perf_counter() - start
+    return report
+
+def print_report(report: Dict[str, Any], workers: int) -> None:
+    count = report["count"]; elapsed = report["elapsed"]
+    print(f"Tournois simulés : {count} en {elapsed:.2f}s ({count / elapsed:.1f} tournois/s, {workers} processus)")
+    total_cpu = sum(report["timings"].values()) or 1.0
+    print("Temps par phase (cumulé sur tous les processus) :")
+    for phase, value in report["timings"].items():
+        print(f"  {phase:<18} {value:9.3f}s  {value / total_cpu * 100:5.1f}%  {value / count * 1000:8.3f} ms/tournoi")
+    if not report["failures"]:
+        print("Invariants : OK")
+        return
+    print("Violations d'invariants :")
+    for violation, n in report["failures"].most_common():
+        print(f"  {n:>8} x {violation}  (ex: {report['examples'][violation]})")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulateur de tournois sans HTTP ni Mongo (tests de débit et d'invariants).")
+    parser.add_argument("--count", type=int, default=1000, help="Nombre de tournois à simuler")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Nombre de processus")
+    parser.add_argument("--seed", type=int, default=None, help="Graine de base (aléatoire si absente)")
+    parser.add_argument("--format", choices=FORMATS + ["all"], default="all")
+    parser.add_argument("--stage", choices=STAGES + ["all"], default="all", help="Première phase : poules ou rondes suisses")
+    parser.add_argument("--players", type=int, default=None, help="Taille fixe (sinon toutes les tailles supportées)")
+    parser.add_argument("--include-large", action="store_true", help=f"Ajoute les grands tableaux suisses {SWISS_LARGE_SIZES}")
+    args = parser.parse_args(argv)
+    if args.count < 1: parser.error("--count doit être supérieur à 0")
+
+    formats = FORMATS if args.format == "all" else [args.format]
+    stages = STAGES if args.stage == "all" else [args.stage]
+    configs = supported_configs(stages, formats, args.include_large or (args.players or 0) > MAX_PLAYERS)
+    if args.players is not None: configs = [c for c in configs if c[2] == args.players]
+    if not configs: parser.error("Aucune configuration supportée pour ces paramètres")
+    base_seed = args.seed if args.seed is not None else random.randrange(2**31)
+    print(f"Graine de base : {base_seed} — {len(configs)} configurations (phase, format, joueurs)")
+
+    report = run_simulation(args.count, max(1, args.workers), base_seed, configs)
+    print_report(report, max(1, args.workers))
+    return 1 if report["failures"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
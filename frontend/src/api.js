@@ -35,20 +35,27 @@ export const getPublicTournaments = async () => {
 };
 
 // --- SUPER ADMIN API ---
-export const getPendingUsers = async () => {
+// Listes paginées : params = { q, cursor, limit }. Le total et le curseur suivant arrivent dans les en-têtes.
+const toUsersPage = (response) => ({
+    users: response.data,
+    total: response.headers['x-total-count'] !== undefined ? Number(response.headers['x-total-count']) : null,
+    nextCursor: response.headers['x-next-cursor'] || null,
+});
+
+export const getPendingUsers = async (params = {}) => {
     try {
-        const response = await apiClient.get('/api/admin/users/pending');
-        return response.data;
+        const response = await apiClient.get('/api/admin/users/pending', { params });
+        return toUsersPage(response);
     } catch (error) {
         console.error("Error fetching pending users:", error);
         throw error;
     }
 };
 
-export const getAllUsers = async () => {
+export const getAllUsers = async (params = {}) => {
     try {
-        const response = await apiClient.get('/api/admin/users');
-        return response.data;
+        const response = await apiClient.get('/api/admin/users', { params });
+        return toUsersPage(response);
     } catch (error) {
         console.error("Error fetching all users:", error);
         throw error;
@@ -141,6 +148,16 @@ export const generateNextRound = async (tournamentId) => {
   }
 };
 
+export const generateSwissRound = async (tournamentId) => {
+  try {
+    const response = await apiClient.post(`/api/tournament/${tournamentId}/swiss/next_round`);
+    return response.data;
+  } catch (error) {
+    console.error("Error generating swiss round:", error.response?.data || error.message);
+    throw error;
+  }
+};
+
 export const getTournament = async (tournamentId) => {
   try {
     if (tournamentId === 'active') {
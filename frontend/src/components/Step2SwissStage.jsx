@@ -0,0 +1,242 @@
+/* Fichier: frontend/src/components/Step2SwissStage.jsx */
+import { useState, useMemo } from 'react';
+import { ArrowRight, Edit, Loader2, Lock, Search } from 'lucide-react';
+import { Button } from './ui/button';
+import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter } from './ui/dialog';
+import { Input } from './ui/input';
+import { Label } from './ui/label';
+import { useToast } from '../hooks/use-toast';
+import { updateScore, completeGroupStage, generateSwissRound } from '../api';
+
+// Même seuil que le serveur (qualifier_target_logic)
+const getTargetQualifiedCount = (totalEntities) => {
+  if (totalEntities <= 8) return 4;
+  if (totalEntities <= 16) return 8;
+  return totalEntities >= 24 ? 16 : 8;
+};
+
+// Même ordre que le serveur : points, Buchholz, différence de buts, buts marqués
+const compareSwissPlayers = (a, b) =>
+  (b.points - a.points) || (b.buchholz - a.buchholz) || (b.goalDiff - a.goalDiff) || (b.goalsFor - a.goalsFor);
+
+const Step2SwissStage = ({ tournamentId, swissPlayers, swissMatches, swissRound, swissTotalRounds, onUpdate, isAdmin }) => {
+  const [selectedMatch, setSelectedMatch] = useState(null);
+  const [score1, setScore1] = useState('');
+  const [score2, setScore2] = useState('');
+  const [isDialogOpen, setIsDialogOpen] = useState(false);
+  const [isSavingScore, setIsSavingScore] = useState(false);
+  const [isAdvancing, setIsAdvancing] = useState(false);
+  const [filter, setFilter] = useState('');
+  const { toast } = useToast();
+
+  const standings = useMemo(() => [...swissPlayers].sort(compareSwissPlayers), [swissPlayers]);
+  const currentMatches = useMemo(() => swissMatches.filter(m => m.round === swissRound - 1), [swissMatches, swissRound]);
+  const roundFinished = currentMatches.every(m => m.played);
+  const allRoundsPlayed = swissRound >= swissTotalRounds;
+  const targetQualifiedCount = getTargetQualifiedCount(swissPlayers.length);
+
+  // Filtre par nom : les grands tournois (jusqu'à 2048 participants) restent lisibles
+  const needle = filter.trim().toLowerCase();
+  const matchesPlayer = (name) => !needle || (name || '').toLowerCase().includes(needle);
+  const visibleStandings = standings.map((player, index) => ({ ...player, rank: index + 1 })).filter(p => matchesPlayer(p.name));
+  const visibleMatches = currentMatches.filter(m => matchesPlayer(m.player1) || matchesPlayer(m.player2));
+
+  const handleMatchClick = (match) => {
+    if (!isAdmin) {
+        toast({ title: 'Mode Spectateur', description: 'Vous ne pouvez pas modifier les scores.', variant: 'default' });
+        return;
+    }
+    if (!match.player2) return; // Exempt
+    setSelectedMatch(match);
+    setScore1(match.score1 !== null ? match.score1.toString() : '');
+    setScore2(match.score2 !== null ? match.score2.toString() : '');
+    setIsDialogOpen(true);
+  };
+
+  const handleScoreSubmit = async () => {
+     const s1 = parseInt(score1);
+     const s2 = parseInt(score2);
+     if (isNaN(s1) || isNaN(s2) || s1 < 0 || s2 < 0) {
+       toast({ title: 'Erreur', description: 'Scores invalides.', variant: 'destructive' });
+       return;
+     }
+     if (!selectedMatch) return;
+     setIsSavingScore(true);
+     try {
+       const updatedTournament = await updateScore(tournamentId, selectedMatch.id, s1, s2);
+       onUpdate(updatedTournament);
+       setIsDialogOpen(false);
+       toast({ title: 'Score enregistré', description: `${selectedMatch.player1} ${s1} - ${s2} ${selectedMatch.player2}` });
+       setSelectedMatch(null);
+     } catch (error) {
+         toast({ title: 'Erreur API', description: error.response?.data?.detail || "Impossible d'enregistrer le score.", variant: 'destructive' });
+         console.error("Failed to update score:", error);
+     } finally {
+        setIsSavingScore(false);
+     }
+  };
+
+  const handleAdvance = async () => {
+    setIsAdvancing(true);
+    try {
+      if (allRoundsPlayed) {
+        onUpdate(await completeGroupStage(tournamentId));
+        toast({ title: 'Phase suisse terminée !', description: 'Place au tableau final.' });
+      } else {
+        onUpdate(await generateSwissRound(tournamentId));
+        toast({ title: `Ronde ${swissRound + 1} appariée` });
+      }
+    } catch (error) {
+      toast({ title: 'Erreur', description: error.response?.data?.detail || "Impossible de passer à la suite.", variant: 'destructive' });
+      console.error("Failed to advance swiss stage:", error);
+    } finally {
+      setIsAdvancing(false);
+    }
+  };
+
+  return (
+     <div className="max-w-7xl mx-auto space-y-8">
+      <div className="text-center">
+        <h2 className="text-3xl font-bold text-white mb-2">Rondes Suisses</h2>
+        <p className="text-gray-400">Ronde {swissRound} / {swissTotalRounds} — {swissPlayers.length} participants, les {targetQualifiedCount} premiers seront qualifiés.</p>
+      </div>
+
+      <div className="relative max-w-md mx-auto">
+        <Search className="absolute left-3 top-1/2 -translate-y-1/2 w-4 h-4 text-gray-500" />
+        <Input value={filter} onChange={(e) => setFilter(e.target.value)} placeholder="Rechercher un joueur / une équipe" className="pl-9 bg-gray-800 border-gray-600 text-white" />
+      </div>
+
+      <div className="grid grid-cols-1 lg:grid-cols-2 gap-8">
+        <div className="bg-gradient-to-br from-gray-900 to-gray-800 rounded-2xl p-6 shadow-2xl border border-gray-700">
+          <h3 className="text-2xl font-bold text-cyan-400 mb-4">Ronde {swissRound}</h3>
+          <div className="space-y-2 max-h-[600px] overflow-y-auto pr-2">
+            {visibleMatches.map((match) => (
+              <button
+                key={match.id}
+                onClick={() => handleMatchClick(match)}
+                className={`w-full bg-gradient-to-r from-gray-800/70 to-gray-900/50 rounded-lg p-3 transition-all duration-300 border border-gray-700/50 group text-left ${
+                  isAdmin && match.player2 ? 'hover:from-gray-700/80 hover:to-gray-800/60 hover:border-cyan-400/80 hover:shadow-md hover:shadow-cyan-500/20 cursor-pointer' : 'cursor-default'
+                }`}
+                disabled={!isAdmin || !match.player2}
+              >
+                <div className="flex justify-between items-center">
+                  <span className="text-white font-medium">{match.player1}</span>
+                  {match.player2 ? (
+                    <div className="flex items-center gap-2">
+                      {match.played ? (
+                        <span className="text-cyan-400 font-bold">{match.score1} - {match.score2}</span>
+                      ) : (
+                        <span className="text-gray-500">vs</span>
+                      )}
+                      {isAdmin ? (
+                        <Edit className="w-4 h-4 text-gray-500 group-hover:text-cyan-400 transition-colors" />
+                      ) : (
+                        <Lock className="w-4 h-4 text-gray-600" />
+                      )}
+                    </div>
+                  ) : (
+                    <span className="text-yellow-400 text-sm">Exempt (+3 pts)</span>
+                  )}
+                  <span className="text-white font-medium">{match.player2 || ''}</span>
+                </div>
+              </button>
+            ))}
+          </div>
+        </div>
+
+        <div className="bg-gradient-to-br from-gray-900 to-gray-800 rounded-2xl p-6 shadow-2xl border border-gray-700">
+          <h3 className="text-2xl font-bold text-cyan-400 mb-4">Classement</h3>
+          <div className="overflow-x-auto max-h-[600px] overflow-y-auto pr-2">
+            <table className="w-full text-sm">
+              <thead>
+                <tr className="border-b border-gray-700">
+                  <th className="text-left py-2 px-2 text-gray-400">Rank</th>
+                  <th className="text-left py-2 px-2 text-gray-400">Joueur / Équipe</th>
+                  <th className="hidden sm:table-cell text-center py-2 px-1 text-gray-400">J</th>
+                  <th className="hidden sm:table-cell text-center py-2 px-1 text-gray-400">G</th>
+                  <th className="hidden sm:table-cell text-center py-2 px-1 text-gray-400">N</th>
+                  <th className="hidden sm:table-cell text-center py-2 px-1 text-gray-400">P</th>
+                  <th className="text-center py-2 px-1 text-gray-400">Diff</th>
+                  <th className="text-center py-2 px-1 text-gray-400">Buch.</th>
+                  <th className="text-center py-2 px-1 text-gray-400 font-bold">Pts</th>
+                </tr>
+              </thead>
+              <tbody>
+                {visibleStandings.map((player) => {
+                  const isQualified = player.rank <= targetQualifiedCount;
+                  return (
+                    <tr key={player.name} className={`border-b border-gray-800 transition-colors ${isQualified ? 'bg-green-900/20' : ''}`}>
+                      <td className={`py-2 px-2 font-medium ${isQualified ? 'text-green-400' : 'text-gray-500'}`}>{player.rank}</td>
+                      <td className={`py-2 px-2 font-medium ${isQualified ? 'text-white' : 'text-gray-400'}`}>{player.name}</td>
+                      <td className="hidden sm:table-cell text-center py-2 px-1 text-gray-300">{player.played}</td>
+                      <td className="hidden sm:table-cell text-center py-2 px-1 text-green-400">{player.won}</td>
+                      <td className="hidden sm:table-cell text-center py-2 px-1 text-yellow-400">{player.drawn}</td>
+                      <td className="hidden sm:table-cell text-center py-2 px-1 text-red-400">{player.lost}</td>
+                      <td className="text-center py-2 px-1 text-gray-300">{player.goalDiff > 0 ? '+' : ''}{player.goalDiff}</td>
+                      <td className="text-center py-2 px-1 text-gray-300">{player.buchholz}</td>
+                      <td className="text-center py-2 px-1 text-cyan-400 font-bold">{player.points}</td>
+                    </tr>
+                  );
+                })}
+              </tbody>
+            </table>
+          </div>
+        </div>
+      </div>
+
+      {isAdmin && roundFinished && (
+        <div className="flex justify-center mt-8">
+          <Button
+            onClick={handleAdvance}
+            disabled={isAdvancing}
+            className="py-6 px-8 text-lg font-semibold bg-gradient-to-r from-cyan-500 to-blue-600 hover:from-cyan-600 hover:to-blue-700 text-white transition-all duration-300 shadow-lg shadow-cyan-500/30"
+          >
+            {isAdvancing ? <Loader2 className="mr-2 h-6 w-6 animate-spin" /> : <ArrowRight className="ml-2 w-5 h-5" />}
+            {isAdvancing ? "Validation..." : allRoundsPlayed ? "Terminer les rondes suisses et tirer le tableau final" : `Apparier la ronde ${swissRound + 1}`}
+          </Button>
+        </div>
+      )}
+
+      <Dialog open={isDialogOpen} onOpenChange={setIsDialogOpen}>
+        <DialogContent className="bg-gray-900 border-gray-700">
+          <DialogHeader>
+            <DialogTitle className="text-2xl text-white">
+              {selectedMatch && (
+                <>
+                  {selectedMatch.player1}
+                  <span className="text-cyan-400 mx-2">vs</span>
+                  {selectedMatch.player2}
+                </>
+              )}
+            </DialogTitle>
+          </DialogHeader>
+          <div className="space-y-6 mt-4">
+             <div className="grid grid-cols-2 gap-4">
+               <div>
+                 <Label className="text-gray-300 mb-2 block">{selectedMatch?.player1}</Label>
+                 <Input type="number" min="0" value={score1} onChange={(e) => setScore1(e.target.value)} placeholder="Score" className="text-2xl text-center bg-gray-800 border-gray-600 text-white" disabled={isSavingScore} />
+               </div>
+               <div>
+                 <Label className="text-gray-300 mb-2 block">{selectedMatch?.player2}</Label>
+                 <Input type="number" min="0" value={score2} onChange={(e) => setScore2(e.target.value)} placeholder="Score" className="text-2xl text-center bg-gray-800 border-gray-600 text-white" disabled={isSavingScore} />
+               </div>
+             </div>
+             <DialogFooter>
+                <Button variant="outline" onClick={() => setIsDialogOpen(false)} disabled={isSavingScore}>Annuler</Button>
+                <Button
+                    onClick={handleScoreSubmit}
+                    disabled={isSavingScore || score1 === '' || score2 === ''}
+                    className="bg-gradient-to-r from-cyan-500 to-blue-600 hover:from-cyan-600 hover:to-blue-700 text-white"
+                >
+                    {isSavingScore ? <Loader2 className="mr-2 h-4 w-4 animate-spin" /> : null}
+                    {isSavingScore ? "Enregistrement..." : "Enregistrer le score"}
+                </Button>
+             </DialogFooter>
+          </div>
+        </DialogContent>
+      </Dialog>
+     </div>
+  );
+};
+
+export default Step2SwissStage;
@@ -2,6 +2,7 @@
 import { useState, useEffect, useCallback, useRef } from 'react';
 import Step1Registration from './Step1Registration';
 import Step2GroupStage from './Step2GroupStage';
+import Step2SwissStage from './Step2SwissStage';
 import Step3Qualification from './Step3Qualification';
 import Step4Bracket from './Step4Bracket';
 import { Trophy, Loader2, Check, ShieldOff, LogOut, Users, Trash2 } from 'lucide-react'; 
@@ -25,6 +26,11 @@ const TournamentManager = ({ isAdmin, initialData }) => {
   const [currentStep, setCurrentStep] = useState("loading"); 
   const [players, setPlayers] = useState([]);
   const [groups, setGroups] = useState([]);
+  const [stage, setStage] = useState('groups');
+  const [swissPlayers, setSwissPlayers] = useState([]);
+  const [swissMatches, setSwissMatches] = useState([]);
+  const [swissRound, setSwissRound] = useState(0);
+  const [swissTotalRounds, setSwissTotalRounds] = useState(0);
   const [qualifiedPlayers, setQualifiedPlayers] = useState([]); 
   const [eliminatedPlayers, setEliminatedPlayers] = useState([]); 
   const [knockoutMatches, setKnockoutMatches] = useState([]);
@@ -69,6 +75,9 @@ const TournamentManager = ({ isAdmin, initialData }) => {
         if (prevStepRef.current === "groups" && (newStep === "qualified" || newStep === "knockout")) {
             toast({ title: "Phase terminée", description: "La phase de poules est terminée. Place à la suite !", duration: 4000 });
         }
+        if (prevStepRef.current === "swiss" && newStep === "knockout") {
+            toast({ title: "Phase terminée", description: "Les rondes suisses sont terminées. Place à la suite !", duration: 4000 });
+        }
     }
     
     // Notification de victoire (seulement si nouveau vainqueur)
@@ -83,11 +92,16 @@ const TournamentManager = ({ isAdmin, initialData }) => {
     setCurrentStep(newStep);
     setPlayers(data.players || []);
     setGroups(data.groups || []);
+    setStage(data.stage || 'groups');
+    setSwissPlayers(data.swissPlayers || []);
+    setSwissMatches(data.swissMatches || []);
+    setSwissRound(data.swissRound || 0);
+    setSwissTotalRounds(data.swissTotalRounds || 0);
 
     if (data.qualifiedPlayers && data.players) {
         const qualifiedObjects = [];
         const elimObjects = [];
-        const allPlayerStats = data.groups ? data.groups.flatMap(g => g.players) : [];
+        const allPlayerStats = data.stage === 'swiss' ? (data.swissPlayers || []) : data.groups ? data.groups.flatMap(g => g.players) : [];
 
         data.qualifiedPlayers.forEach(name => {
              const stats = allPlayerStats.find(p => p.name === name);
@@ -200,6 +214,8 @@ const TournamentManager = ({ isAdmin, initialData }) => {
         return <Step1Registration onComplete={handleTournamentUpdate} isAdmin={isAdmin} />;
       case 'groups':
         return <Step2GroupStage tournamentId={tournamentId} players={players} groups={groups} onGroupsDrawn={handleTournamentUpdate} onScoreUpdate={handleTournamentUpdate} onCompleteGroups={handleTournamentUpdate} isAdmin={isAdmin} format={format} />;
+      case 'swiss':
+        return <Step2SwissStage tournamentId={tournamentId} swissPlayers={swissPlayers} swissMatches={swissMatches} swissRound={swissRound} swissTotalRounds={swissTotalRounds} onUpdate={handleTournamentUpdate} isAdmin={isAdmin} />;
       case 'qualified': 
         return <Step3Qualification tournamentId={tournamentId} groups={groups} qualifiedPlayers={qualifiedPlayers} eliminatedPlayers={eliminatedPlayers} onKnockoutDrawComplete={handleTournamentUpdate} isAdmin={isAdmin} />;
       case 'knockout': 
@@ -262,11 +278,11 @@ const TournamentManager = ({ isAdmin, initialData }) => {
        <div className="flex flex-col sm:flex-row justify-center items-center sm:items-start gap-4 mb-16"> 
            {[
              { num: 1, name: 'Config', stepKey: 'config' },
-             { num: 2, name: 'Poules', stepKey: 'groups' },
+             stage === 'swiss' ? { num: 2, name: 'Rondes', stepKey: 'swiss' } : { num: 2, name: 'Poules', stepKey: 'groups' },
              { num: 3, name: 'Qualif.', stepKey: 'qualified' }, 
              { num: 4, name: 'Finales', stepKey: 'knockout' } 
            ].map((stepInfo, index, arr) => {
-               const stepOrder = ['config', 'groups', 'qualified', 'knockout', 'finished'];
+               const stepOrder = ['config', stage === 'swiss' ? 'swiss' : 'groups', 'qualified', 'knockout', 'finished'];
                const currentStepIndex = currentStep === 'no_tournament' ? -1 : stepOrder.indexOf(currentStep);
                const thisStepLogicalIndex = stepOrder.findIndex(s => s === stepInfo.stepKey);
                const isActive = (currentStep === stepInfo.stepKey) || (stepInfo.stepKey === 'knockout' && currentStep === 'finished');
@@ -46,8 +46,9 @@ const DashboardPage = () => {
         // Si Super Admin, on vérifie s'il y a des comptes en attente pour la notif
         if (user?.role === 'super_admin') {
             try {
-                const pendingUsers = await getPendingUsers();
-                setPendingCount(pendingUsers.length);
+                // Une seule entrée suffit : le total vient des compteurs serveur
+                const pending = await getPendingUsers({ limit: 1 });
+                setPendingCount(pending.total ?? pending.users.length);
             } catch (e) {
                 // Silent fail pour la notif, pas grave
             }
@@ -8,11 +8,19 @@ import { useAuth } from '../context/AuthContext';
 import { useNavigate } from 'react-router-dom';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '../components/ui/tabs';
 import { Badge } from '../components/ui/badge';
+import { Input } from '../components/ui/input';
 
 const SuperAdminDashboard = () => {
     const [pendingUsers, setPendingUsers] = useState([]);
+    const [pendingTotal, setPendingTotal] = useState(0);
+    const [pendingCursor, setPendingCursor] = useState(null);
     const [allUsers, setAllUsers] = useState([]);
+    const [allTotal, setAllTotal] = useState(null);
+    const [allCursor, setAllCursor] = useState(null);
+    const [search, setSearch] = useState('');
+    const [appliedSearch, setAppliedSearch] = useState(''); // Recherche ayant produit allCursor
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const { toast } = useToast();
     const { user, logout } = useAuth();
     const navigate = useNavigate();
@@ -20,9 +28,13 @@ const SuperAdminDashboard = () => {
     const fetchAllData = async () => {
         try {
             setLoading(true);
-            const [pending, all] = await Promise.all([getPendingUsers(), getAllUsers()]);
-            setPendingUsers(pending);
-            setAllUsers(all);
+            const [pending, all] = await Promise.all([getPendingUsers(), getAllUsers({ q: appliedSearch || undefined })]);
+            setPendingUsers(pending.users);
+            setPendingTotal(pending.total ?? pending.users.length);
+            setPendingCursor(pending.nextCursor);
+            setAllUsers(all.users);
+            setAllTotal(all.total);
+            setAllCursor(all.nextCursor);
         } catch (error) {
             toast({ title: "Erreur", description: "Impossible de charger les données.", variant: "destructive" });
         } finally {
@@ -34,6 +46,50 @@ const SuperAdminDashboard = () => {
         fetchAllData();
     }, []);
 
+    const loadMorePending = async () => {
+        try {
+            setLoadingMore(true);
+            const page = await getPendingUsers({ cursor: pendingCursor });
+            setPendingUsers((prev) => [...prev, ...page.users]);
+            setPendingCursor(page.nextCursor);
+        } catch (error) {
+            toast({ title: "Erreur", description: "Impossible de charger la suite.", variant: "destructive" });
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    const loadMoreUsers = async () => {
+        try {
+            setLoadingMore(true);
+            // Le curseur n'est valide que pour la recherche qui l'a produit, pas pour le texte en cours de saisie
+            const page = await getAllUsers({ q: appliedSearch || undefined, cursor: allCursor });
+            setAllUsers((prev) => [...prev, ...page.users]);
+            setAllCursor(page.nextCursor);
+        } catch (error) {
+            toast({ title: "Erreur", description: "Impossible de charger la suite.", variant: "destructive" });
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    const handleSearch = async (e) => {
+        e.preventDefault();
+        try {
+            setLoadingMore(true);
+            const query = search.trim();
+            const page = await getAllUsers({ q: query || undefined });
+            setAppliedSearch(query);
+            setAllUsers(page.users);
+            setAllCursor(page.nextCursor);
+            if (page.total !== null) setAllTotal(page.total);
+        } catch (error) {
+            toast({ title: "Erreur", description: "Recherche impossible.", variant: "destructive" });
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleApprove = async (username) => {
         try {
             await approveUser(username);
@@ -93,7 +149,7 @@ const SuperAdminDashboard = () => {
                         <TabsList className="grid w-full grid-cols-2 mb-6 bg-gray-800">
                             <TabsTrigger value="pending" className="data-[state=active]:bg-gray-700 data-[state=active]:text-white">
                                 En Attente 
-                                {pendingUsers.length > 0 && <Badge variant="destructive" className="ml-2 px-2 py-0.5 h-5">{pendingUsers.length}</Badge>}
+                                {pendingTotal > 0 && <Badge variant="destructive" className="ml-2 px-2 py-0.5 h-5">{pendingTotal}</Badge>}
                             </TabsTrigger>
                             <TabsTrigger value="all" className="data-[state=active]:bg-gray-700 data-[state=active]:text-white">
                                 Gestion des Utilisateurs
@@ -134,6 +190,11 @@ const SuperAdminDashboard = () => {
                                             </div>
                                         </div>
                                     ))}
+                                    {pendingCursor && (
+                                        <Button variant="outline" onClick={loadMorePending} disabled={loadingMore} className="border-gray-600 text-gray-300">
+                                            {loadingMore ? <Loader2 className="w-4 h-4 animate-spin" /> : "Charger plus"}
+                                        </Button>
+                                    )}
                                 </div>
                             )}
                         </TabsContent>
@@ -142,7 +203,12 @@ const SuperAdminDashboard = () => {
                             <h2 className="text-xl font-semibold text-gray-200 mb-6 flex items-center gap-2">
                                 <Users className="w-5 h-5" />
                                 Liste complète des comptes
+                                {allTotal !== null && <Badge variant="secondary" className="ml-2">{allTotal}</Badge>}
                             </h2>
+                            <form onSubmit={handleSearch} className="flex gap-2 mb-4">
+                                <Input value={search} onChange={(e) => setSearch(e.target.value)} placeholder="Rechercher un nom d'utilisateur (début du nom)" maxLength={30} className="bg-gray-800 border-gray-700 text-white" />
+                                <Button type="submit" variant="outline" disabled={loadingMore} className="border-gray-600 text-gray-300">Rechercher</Button>
+                            </form>
                              {loading ? (
                                 <div className="flex justify-center py-12"><Loader2 className="w-8 h-8 animate-spin text-cyan-500" /></div>
                             ) : (
@@ -164,6 +230,11 @@ const SuperAdminDashboard = () => {
                                             )}
                                         </div>
                                     ))}
+                                    {allCursor && (
+                                        <Button variant="outline" onClick={loadMoreUsers} disabled={loadingMore} className="border-gray-600 text-gray-300">
+                                            {loadingMore ? <Loader2 className="w-4 h-4 animate-spin" /> : "Charger plus"}
+                                        </Button>
+                                    )}
                                 </div>
                             )}
                         </TabsContent>
@@ -0,0 +1,73 @@
+import copy
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Le backend n'est pas un paquet installable : server.py est importé depuis son dossier
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+class FakeTournamentsCollection:
+    # Sous-ensemble de l'API Motor utilisé par l'acteur de tournoi (find_one / update_one $set)
+    def __init__(self):
+        self.docs = {}
+        self.updates = []
+        self.clock = 0 # operationTime simulé, avancé à chaque opération faite dans une session
+        self.sessions = []
+
+    def _tick(self, session):
+        self.clock += 1
+        if session is not None:
+            self.sessions.append(session)
+            session.advance_cluster_time(self.clock); session.advance_operation_time(self.clock)
+
+    def _matches(self, doc, query):
+        for key, expected in query.items():
+            if isinstance(expected, dict) and "$exists" in expected:
+                if (key in doc) != expected["$exists"]: return False
+            elif doc.get(key) != expected: return False
+        return True
+
+    async def find_one(self, query, session=None):
+        self._tick(session)
+        doc = self.docs.get(query["_id"])
+        return copy.deepcopy(doc) if doc is not None and self._matches(doc, query) else None
+
+    async def update_one(self, query, update, session=None):
+        self._tick(session)
+        self.updates.append((copy.deepcopy(query), copy.deepcopy(update)))
+        doc = self.docs.get(query["_id"])
+        if doc is None or not self._matches(doc, query): return SimpleNamespace(matched_count=0)
+        doc.update(copy.deepcopy(update["$set"]))
+        return SimpleNamespace(matched_count=1)
+
+
+class FakeSession:
+    # Session causale simulée : les temps n'avancent jamais en arrière
+    def __init__(self, cluster_time=None, operation_time=None):
+        self.cluster_time = cluster_time
+        self.operation_time = operation_time
+
+    def advance_cluster_time(self, value): self.cluster_time = max(self.cluster_time or 0, value)
+    def advance_operation_time(self, value): self.operation_time = max(self.operation_time or 0, value)
+
+    async def __aenter__(self): return self
+    async def __aexit__(self, *exc): pass
+
+
+class FakeClient:
+    async def start_session(self, causal_consistency=True):
+        return FakeSession()
+
+
+@pytest.fixture
+def fake_tournaments(monkeypatch):
+    monkeypatch.setattr(server, "client", FakeClient())
+    collection = FakeTournamentsCollection()
+    monkeypatch.setattr(server, "tournaments_collection", collection)
+    monkeypatch.setattr(server, "tournament_actors", {})
+    return collection
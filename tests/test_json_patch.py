@@ -0,0 +1,106 @@
+import copy
+import json
+
+import pytest
+from starlette.requests import Request
+
+from server import JSON_PATCH_MEDIA_TYPE, Tournament, build_tournament_response, compute_json_patch
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def apply_patch(doc, patch):
+    # Applique un JSON Patch (sous-ensemble add/remove/replace produit par compute_json_patch)
+    doc = copy.deepcopy(doc)
+    for op in patch:
+        if op["path"] == "":
+            assert op["op"] == "replace"
+            doc = copy.deepcopy(op["value"])
+            continue
+        *parents, last = [_unescape(t) for t in op["path"].split("/")[1:]]
+        target = doc
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        if isinstance(target, list):
+            index = int(last)
+            if op["op"] == "add": target.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove": del target[index]
+            else: target[index] = copy.deepcopy(op["value"])
+        else:
+            if op["op"] == "remove": del target[last]
+            else: target[last] = copy.deepcopy(op["value"])
+    return doc
+
+
+@pytest.mark.parametrize("old, new", [
+    ({"a": 1, "b": 2}, {"a": 1, "c": 3}),
+    ({"a": {"b": 1}}, {"a": {"b": 2, "c": [1, 2]}}),
+    ({"items": [1, 2]}, {"items": [1, 2, 3, 4]}),
+    ({"items": [1, 2, 3, 4]}, {"items": [9]}),
+    ({"items": [{"x": 1}, {"x": 2}]}, {"items": [{"x": 1, "y": 0}]}),
+    ({"a": [1, 2]}, {"a": {"0": 1}}),
+    ({"a": None}, {"a": "x"}),
+    ({"a~b": 1, "c/d": {"e~/f": 1}}, {"a~b": 2, "c/d": {"e~/f": 2, "~": 3}}),
+    ([1, 2, 3], {"a": 1}),
+    ({"a": 1}, "texte"),
+])
+def test_patch_transforms_old_into_new(old, new):
+    assert apply_patch(old, compute_json_patch(old, new)) == new
+
+
+def test_identical_documents_produce_empty_patch():
+    doc = {"a": [1, {"b": None}], "c": "x"}
+    assert compute_json_patch(doc, copy.deepcopy(doc)) == []
+
+
+def test_pointer_escaping():
+    patch = compute_json_patch({}, {"a~b/c": 1})
+    assert patch == [{"op": "add", "path": "/a~0b~1c", "value": 1}]
+
+
+def test_root_type_change_replaces_whole_document():
+    assert compute_json_patch([1], {"a": 1}) == [{"op": "replace", "path": "", "value": {"a": 1}}]
+
+
+def _request(headers=None, query=""):
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": raw_headers, "query_string": query.encode()})
+
+
+def _tournaments():
+    before = Tournament(name="Coupe", players=["A", "B"], version=3)
+    after = before.model_copy(update={"version": 4, "winner": "A", "currentStep": "finished"})
+    return before, after
+
+
+def test_delta_response_when_base_version_matches():
+    before, after = _tournaments()
+    response = build_tournament_response(_request({"Accept": JSON_PATCH_MEDIA_TYPE, "X-Base-Version": "3"}), before, after)
+    assert response.media_type == JSON_PATCH_MEDIA_TYPE
+    assert response.headers["X-Tournament-Version"] == "4"
+    patch = json.loads(response.body)
+    assert apply_patch(before.model_dump(mode="json", by_alias=True), patch) == after.model_dump(mode="json", by_alias=True)
+
+
+def test_delta_response_via_query_parameters():
+    before, after = _tournaments()
+    response = build_tournament_response(_request(query="delta=1&base_version=3"), before, after)
+    assert response.media_type == JSON_PATCH_MEDIA_TYPE
+
+
+@pytest.mark.parametrize("headers, query", [
+    ({"Accept": JSON_PATCH_MEDIA_TYPE, "X-Base-Version": "2"}, ""),
+    ({"Accept": JSON_PATCH_MEDIA_TYPE}, ""),
+    ({"Accept": JSON_PATCH_MEDIA_TYPE, "X-Base-Version": "abc"}, ""),
+    ({"X-Base-Version": "3"}, ""),
+])
+def test_full_document_fallback(headers, query):
+    before, after = _tournaments()
+    assert build_tournament_response(_request(headers, query), before, after) is after
+
+
+def test_full_document_without_previous_snapshot():
+    _, after = _tournaments()
+    assert build_tournament_response(_request({"Accept": JSON_PATCH_MEDIA_TYPE, "X-Base-Version": "3"}), None, after) is after
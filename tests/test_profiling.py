@@ -0,0 +1,66 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import server
+from server import MongoProfilingListener, current_profile_stats, submit_tournament_command
+from tests.test_tournament_actor import append_player, make_tournament
+
+listener = MongoProfilingListener()
+
+
+def new_stats():
+    return {"active": True, "commands": 0, "waitMs": 0.0, "lock": threading.Lock()}
+
+
+def instrument(collection):
+    # Chaque opération simule l'événement du driver, émis dans le contexte de l'appelant (comme Motor)
+    for name in ("find_one", "update_one"):
+        original = getattr(collection, name)
+
+        async def wrapped(*args, _original=original, **kwargs):
+            listener._record(SimpleNamespace(duration_micros=2000))
+            return await _original(*args, **kwargs)
+        setattr(collection, name, wrapped)
+
+
+async def submit_as(stats, tournament_id, command):
+    # Équivalent de ProfilingMiddleware : la requête s'exécute avec ses compteurs dans le contexte
+    if stats is None: return await submit_tournament_command(tournament_id, command)
+    token = current_profile_stats.set((stats,))
+    try: return await submit_tournament_command(tournament_id, command)
+    finally: current_profile_stats.reset(token)
+
+
+def test_actor_mongo_time_is_credited_to_the_profiled_request(fake_tournaments):
+    instrument(fake_tournaments)
+    doc = make_tournament(fake_tournaments)
+    creator, profiled = new_stats(), new_stats()
+
+    async def scenario():
+        # L'acteur est créé pendant une requête profilée : sa tâche hérite de ce contexte
+        await submit_as(creator, doc["_id"], append_player("A"))
+        creator_commands = creator["commands"]
+        await submit_as(None, doc["_id"], append_player("B"))
+        assert creator["commands"] == creator_commands
+        await submit_as(profiled, doc["_id"], append_player("C"))
+        return creator_commands
+
+    creator_commands = asyncio.run(scenario())
+    assert creator_commands == 2 # Chargement + écriture
+    assert profiled["commands"] == 1 and profiled["waitMs"] == 2.0
+
+
+def test_batch_mongo_time_is_credited_to_each_profiled_request(fake_tournaments):
+    instrument(fake_tournaments)
+    doc = make_tournament(fake_tournaments)
+    first, second = new_stats(), new_stats()
+
+    async def scenario():
+        await asyncio.gather(submit_as(first, doc["_id"], append_player("A")),
+                             submit_as(None, doc["_id"], append_player("B")),
+                             submit_as(second, doc["_id"], append_player("C")))
+
+    asyncio.run(scenario())
+    assert first["commands"] == second["commands"] == 2
+    assert len(fake_tournaments.updates) == 1
@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
+
+import server
+from server import BOOTSTRAP_MARKER_ID, UserCreate
+
+register_user = server.register_user.__wrapped__ # Sans le rate limiter
+
+
+class FakeCollection:
+    def __init__(self, fail_inserts=0):
+        self.docs = {}
+        self.fail_inserts = fail_inserts
+
+    async def find_one(self, query, **kwargs):
+        return next((dict(d) for d in self.docs.values() if all(d.get(k) == v for k, v in query.items())), None)
+
+    async def insert_one(self, doc):
+        if self.fail_inserts:
+            self.fail_inserts -= 1
+            raise DuplicateKeyError("username dupliqué")
+        doc.setdefault("_id", f"id_{len(self.docs)}")
+        if doc["_id"] in self.docs: raise DuplicateKeyError("_id dupliqué")
+        self.docs[doc["_id"]] = dict(doc)
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def delete_one(self, query):
+        doc = await self.find_one(query)
+        if doc: del self.docs[doc["_id"]]
+
+    async def update_one(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    users, meta = FakeCollection(fail_inserts=1), FakeCollection()
+    monkeypatch.setattr(server, "users_collection", users)
+    monkeypatch.setattr(server, "meta_collection", meta)
+    return users, meta
+
+
+def test_failed_first_signup_releases_bootstrap_marker(collections):
+    users, meta = collections
+
+    async def scenario():
+        with pytest.raises(HTTPException) as error:
+            await register_user(None, UserCreate(username="premier", password="motdepasse1"))
+        assert error.value.status_code == 400
+        assert BOOTSTRAP_MARKER_ID not in meta.docs
+        return await register_user(None, UserCreate(username="second", password="motdepasse2"))
+
+    created = asyncio.run(scenario())
+    assert created.role == "super_admin" and created.status == "active"
+    assert meta.docs[BOOTSTRAP_MARKER_ID]["superAdmin"] == "second"
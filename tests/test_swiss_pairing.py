@@ -0,0 +1,75 @@
+import server
+from server import pair_swiss_players_logic
+
+RANKED = [f"J{i}" for i in range(8)]
+
+
+def met(*pairs):
+    opponents = {name: set() for name in RANKED}
+    for a, b in pairs:
+        opponents[f"J{a}"].add(f"J{b}"); opponents[f"J{b}"].add(f"J{a}")
+    return opponents
+
+
+def rematches(pairs, opponents):
+    return sum(1 for p1, p2 in pairs if p2 in opponents[p1])
+
+
+def assert_complete(pairs):
+    names = [name for pair in pairs for name in pair]
+    assert sorted(names) == sorted(RANKED)
+
+
+def test_backtracking_avoids_rematches():
+    opponents = met((0, 1), (2, 3), (4, 5), (6, 7), (5, 7))
+    pairs = pair_swiss_players_logic(RANKED, opponents)
+    assert_complete(pairs)
+    assert rematches(pairs, opponents) == 0
+
+
+def test_backtrack_cap_keeps_best_partial_pairing(monkeypatch):
+    monkeypatch.setattr(server, "SWISS_PAIRING_MAX_BACKTRACKS", 0)
+    opponents = met((0, 1), (2, 3), (4, 5), (6, 7), (5, 7))
+    pairs = pair_swiss_players_logic(RANKED, opponents)
+    assert_complete(pairs)
+    # L'ordre du classement donnerait 4 revanches : seul le dernier couple restant en est une
+    assert rematches(pairs, opponents) == 1
+
+
+def test_unavoidable_rematch_is_limited_to_leftovers():
+    # Tout le monde a rencontré J7 et J6 : J6 et J7 doivent se rejouer
+    opponents = met(*[(i, 7) for i in range(7)], *[(i, 6) for i in range(6)])
+    pairs = pair_swiss_players_logic(RANKED, opponents)
+    assert_complete(pairs)
+    assert rematches(pairs, opponents) == 1
+
+
+def swiss_tournament(players=8):
+    names = [f"J{i}" for i in range(players)]
+    entities, total_rounds = server.create_swiss_logic(names)
+    return server.Tournament(name="Suisse", players=names, stage="swiss", currentStep="swiss", swissPlayers=entities,
+                             swissTotalRounds=total_rounds).model_dump(by_alias=True)
+
+
+def play_round(tournament):
+    server.generate_swiss_round_logic(tournament)
+    for match in tournament["swissMatches"]:
+        if not match["played"]: server.update_match_score_logic(tournament, match["id"], server.ScoreUpdateRequest(score1=2, score2=1))
+
+
+def test_scores_across_rounds_keep_buchholz_exact():
+    tournament = swiss_tournament()
+    for _ in range(3): play_round(tournament)
+    # Le classement est retrié à chaque ronde : l'index des joueurs doit suivre
+    points = {p["name"]: p["points"] for p in tournament["swissPlayers"]}
+    for p in tournament["swissPlayers"]:
+        assert p["buchholz"] == sum(points[o] for o in p["opponents"])
+
+
+def test_legacy_swiss_match_ids_are_still_found():
+    tournament = swiss_tournament()
+    server.generate_swiss_round_logic(tournament)
+    for m in tournament["swissMatches"]: m["id"] = m["id"].replace("match_swiss_", "match_legacy_")
+    match = tournament["swissMatches"][-1]
+    assert server.update_match_score_logic(tournament, match["id"], server.ScoreUpdateRequest(score1=1, score2=0))
+    assert match["played"]
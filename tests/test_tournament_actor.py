@@ -0,0 +1,234 @@
+import asyncio
+
+from fastapi import HTTPException
+
+import server
+from tests.conftest import FakeSession
+from server import ScoreUpdateRequest, Tournament, create_groups_logic, submit_tournament_command, update_match_score_logic
+
+
+def make_tournament(collection, players=8, version=0):
+    tournament = Tournament(name="Coupe", players=[f"J{i}" for i in range(players)], currentStep="groups",
+                            groups=create_groups_logic([f"J{i}" for i in range(players)], 2), version=version)
+    doc = tournament.model_dump(by_alias=True)
+    collection.docs[doc["_id"]] = doc
+    return doc
+
+
+def append_player(name):
+    def command(t):
+        t["players"].append(name)
+        return {"players"}
+    return command
+
+
+def score(match_id, score1, score2):
+    scores = ScoreUpdateRequest(score1=score1, score2=score2)
+    return lambda t: update_match_score_logic(t, match_id, scores)
+
+
+async def submit_all(tournament_id, commands, want_before=False):
+    return await asyncio.gather(*(submit_tournament_command(tournament_id, c, want_before) for c in commands), return_exceptions=True)
+
+
+def test_concurrent_scores_are_coalesced_into_one_write(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+    match_ids = [m["id"] for g in doc["groups"] for m in g["matches"]]
+    results = asyncio.run(submit_all(doc["_id"], [score(m, 2, 1) for m in match_ids]))
+
+    assert len(fake_tournaments.updates) == 1
+    stored = fake_tournaments.docs[doc["_id"]]
+    assert stored["version"] == len(match_ids)
+    assert all(m["played"] for g in stored["groups"] for m in g["matches"])
+    # Toutes les réponses du lot reflètent l'état écrit
+    assert all(after.version == len(match_ids) for _, after in results)
+
+
+def test_commands_are_applied_in_submission_order(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+    names = [f"X{i}" for i in range(20)]
+    asyncio.run(submit_all(doc["_id"], [append_player(n) for n in names]))
+    assert fake_tournaments.docs[doc["_id"]]["players"][-20:] == names
+
+
+def test_write_only_sets_touched_fields(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+    match_id = doc["groups"][0]["matches"][0]["id"]
+    asyncio.run(submit_all(doc["_id"], [score(match_id, 1, 0)]))
+    query, update = fake_tournaments.updates[0]
+    assert query == {"_id": doc["_id"], "version": 0}
+    assert set(update["$set"]) == {"groups", "version", "updatedAt"}
+
+
+def test_unchanged_score_does_not_write(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+    match_id = doc["groups"][0]["matches"][0]["id"]
+
+    async def scenario():
+        await submit_tournament_command(doc["_id"], score(match_id, 1, 0))
+        return await submit_tournament_command(doc["_id"], score(match_id, 1, 0))
+
+    _, after = asyncio.run(scenario())
+    assert len(fake_tournaments.updates) == 1 and after.version == 1
+
+
+def test_unknown_tournament_is_404(fake_tournaments):
+    [result] = asyncio.run(submit_all("tournoi_inconnu", [append_player("A")]))
+    assert isinstance(result, HTTPException) and result.status_code == 404
+
+
+def test_404_after_delete(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+
+    async def scenario():
+        await submit_tournament_command(doc["_id"], append_player("A"))
+        # Suppression par la route (avec éviction) puis suppression directe en base (autre processus)
+        del fake_tournaments.docs[doc["_id"]]
+        server.evict_tournament_actor(doc["_id"])
+        first = await submit_all(doc["_id"], [append_player("B")])
+        fake_tournaments.docs[doc["_id"]] = dict(doc)
+        await submit_tournament_command(doc["_id"], append_player("C"))
+        del fake_tournaments.docs[doc["_id"]]
+        second = await submit_all(doc["_id"], [append_player("D")])
+        return first + second
+
+    for result in asyncio.run(scenario()):
+        assert isinstance(result, HTTPException) and result.status_code == 404
+
+
+def test_failing_command_is_isolated(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+
+    def broken(t):
+        t["players"].append("CORROMPU")
+        raise RuntimeError("bug")
+
+    def rejected(t):
+        raise HTTPException(status_code=400, detail="refus")
+
+    results = asyncio.run(submit_all(doc["_id"], [append_player("A"), broken, append_player("B"), rejected, append_player("C")]))
+
+    assert isinstance(results[1], HTTPException) and results[1].status_code == 500
+    assert isinstance(results[3], HTTPException) and results[3].status_code == 400
+    stored = fake_tournaments.docs[doc["_id"]]
+    assert stored["players"][-3:] == ["A", "B", "C"]
+    assert "CORROMPU" not in stored["players"]
+    assert stored["version"] == 3
+    assert all(results[i][1].players[-3:] == ["A", "B", "C"] for i in (0, 2, 4))
+
+
+def test_command_producing_invalid_tournament_is_isolated(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+
+    def invalid(t):
+        t["version"] = -5 # Refusé par la validation Pydantic (ge=0)
+        return {"version"}
+
+    results = asyncio.run(submit_all(doc["_id"], [append_player("A"), invalid, append_player("B")]))
+
+    assert isinstance(results[1], HTTPException) and results[1].status_code == 500
+    stored = fake_tournaments.docs[doc["_id"]]
+    assert stored["players"][-2:] == ["A", "B"] and stored["version"] == 2
+
+
+def test_concurrent_write_from_another_process_is_not_overwritten(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+
+    async def scenario():
+        await submit_tournament_command(doc["_id"], append_player("A"))
+        # Un autre worker modifie le tournoi : la copie chaude de cet acteur est périmée
+        stored = fake_tournaments.docs[doc["_id"]]
+        stored["name"] = "Renommé ailleurs"; stored["version"] += 1
+        return await submit_tournament_command(doc["_id"], append_player("B"))
+
+    _, after = asyncio.run(scenario())
+    stored = fake_tournaments.docs[doc["_id"]]
+    assert stored["name"] == "Renommé ailleurs"
+    assert stored["players"][-2:] == ["A", "B"]
+    assert stored["version"] == 3 and after.version == 3
+    assert server.tournament_actors[doc["_id"]].conflicts == 1
+
+
+def test_legacy_tournament_without_version(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+    del fake_tournaments.docs[doc["_id"]]["version"]
+    asyncio.run(submit_all(doc["_id"], [append_player("A")]))
+    query, _ = fake_tournaments.updates[0]
+    assert query == {"_id": doc["_id"], "version": {"$exists": False}}
+    assert fake_tournaments.docs[doc["_id"]]["version"] == 1
+
+
+def test_delta_base_is_the_state_before_the_batch(fake_tournaments):
+    doc = make_tournament(fake_tournaments, version=5)
+    results = asyncio.run(submit_all(doc["_id"], [append_player("A"), append_player("B")], want_before=True))
+    for before, after in results:
+        assert before.version == 5 and after.version == 7
+
+
+def test_admin_causal_session_advances_past_the_batch_write(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+    fake_tournaments.clock = 100
+    admin = FakeSession(cluster_time=90, operation_time=90)
+
+    async def scenario():
+        return await asyncio.gather(submit_tournament_command(doc["_id"], append_player("A"), session=admin),
+                                    submit_tournament_command(doc["_id"], append_player("B")))
+
+    asyncio.run(scenario())
+    batch_session = fake_tournaments.sessions[-1]
+    # Chargement et écriture du lot dans une session avancée au temps de l'admin, puis retour vers l'admin
+    assert batch_session is not admin and fake_tournaments.sessions[0] is batch_session
+    assert admin.operation_time == batch_session.operation_time == fake_tournaments.clock
+
+
+def test_anonymous_batch_uses_no_session(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+    asyncio.run(submit_all(doc["_id"], [append_player("A")]))
+    assert fake_tournaments.sessions == []
+
+
+def _knockout_match(match_id):
+    return server.KnockoutMatch(id=match_id, round=0, matchIndex=0, player1="J0", player2="J1").model_dump()
+
+
+def test_command_on_data_created_by_another_process(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+
+    async def scenario():
+        await submit_tournament_command(doc["_id"], append_player("A"))
+        # Un autre worker ajoute un match : il est absent de la copie chaude de cet acteur
+        stored = fake_tournaments.docs[doc["_id"]]
+        stored["knockoutMatches"] = [_knockout_match("match_new")]; stored["version"] += 1
+        return await submit_tournament_command(doc["_id"], score("match_new", 2, 0))
+
+    _, after = asyncio.run(scenario())
+    stored = fake_tournaments.docs[doc["_id"]]
+    assert stored["knockoutMatches"][0]["played"] and stored["knockoutMatches"][0]["winner"] == "J0"
+    assert stored["players"][-1] == "A" and stored["version"] == 3 and after.version == 3
+
+
+def test_no_op_on_stale_copy_returns_current_state(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+    match_id = doc["groups"][0]["matches"][0]["id"]
+
+    async def scenario():
+        await submit_tournament_command(doc["_id"], score(match_id, 1, 0))
+        stored = fake_tournaments.docs[doc["_id"]]
+        stored["name"] = "Renommé ailleurs"; stored["version"] += 1
+        return await submit_tournament_command(doc["_id"], score(match_id, 1, 0))
+
+    _, after = asyncio.run(scenario())
+    assert after.name == "Renommé ailleurs" and after.version == 2
+    assert len(fake_tournaments.updates) == 1
+
+
+def test_command_failing_on_fresh_copy_is_not_retried(fake_tournaments):
+    doc = make_tournament(fake_tournaments)
+    calls = []
+
+    def rejected(t):
+        calls.append(1)
+        raise HTTPException(status_code=400, detail="refus")
+
+    [result] = asyncio.run(submit_all(doc["_id"], [rejected]))
+    assert result.status_code == 400 and len(calls) == 1
@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from fastapi import Response
+
+import server
+from server import list_users_page
+
+
+class FakeCursor:
+    def __init__(self, docs): self.docs = docs
+    def sort(self, keys):
+        for key, direction in reversed(keys):
+            # Comme MongoDB : null/absent est la plus petite valeur, donc en dernier en tri décroissant
+            self.docs.sort(key=lambda d: (d.get(key) is not None, d.get(key) or 0), reverse=direction < 0)
+        return self
+    def limit(self, n): self.docs = self.docs[:n]; return self
+    async def to_list(self, n): return self.docs[:n]
+
+
+def matches(doc, query):
+    # Sous-ensemble des opérateurs utilisés par list_users_page, avec la sémantique MongoDB pour null
+    for key, expected in query.items():
+        if key == "$or":
+            if not any(matches(doc, q) for q in expected): return False
+        elif isinstance(expected, dict):
+            value = doc.get(key)
+            if "$lt" in expected and (value is None or not value < expected["$lt"]): return False
+            if "$gt" in expected and (value is None or not value > expected["$gt"]): return False
+        elif doc.get(key) != expected: return False
+    return True
+
+
+class FakeUsersCollection:
+    def __init__(self, docs): self.docs = docs
+    def find(self, query, projection=None, session=None):
+        return FakeCursor([dict(d) for d in self.docs if matches(d, query)])
+
+
+def test_pages_cross_from_dated_to_undated_users(monkeypatch):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    dated = [{"_id": ObjectId(), "username": f"d{i}", "createdAt": start + timedelta(days=i)} for i in range(5)]
+    legacy = [{"_id": ObjectId(), "username": f"h{i}"} for i in range(3)] + [{"_id": ObjectId(), "username": "h3", "createdAt": None}]
+    monkeypatch.setattr(server, "users_collection", FakeUsersCollection(dated + legacy))
+
+    async def all_pages():
+        seen, cursor = [], None
+        while True:
+            response = Response()
+            page = await list_users_page(response, {}, None, cursor, 3, None)
+            seen += [u["username"] for u in page]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor: return seen
+
+    seen = asyncio.run(all_pages())
+    assert sorted(seen) == sorted(u["username"] for u in dated + legacy)
+    assert seen[:5] == [f"d{i}" for i in reversed(range(5))]